@@ -9,21 +9,85 @@ __author__ = "Isaac"
 __version__ = "1.0.5"
 __license__ = "GNU General Public License v3.0"
 
-from .bot import Bot
-from .command import Command
-from .event import Event
-from .message import Message, Info
-from .usernotice import UserNotice, Sub, ReSub, SubGift, AnonSubGift, Raid, Ritual, Charity, SubMysteryGift
-from .userstate import UserState, GlobalUserState
-from .join_channel import JoinChannel
-from .join_chatroom import JoinChatRoom
-from .roomstate import RoomState
-from .part_channel import PartChannel
-from .jtv_mode import Mode
-from .cooldown import Cooldown
-from .errors import CommandError, CooldownError, SilencedError, DecoratorError, CogError, EventError, TimedMessageError, CommonError
-from .clearmsg import ClearMsg
-from .clearchat import ClearChat, Ban
-from .general_notice import Notice
-from .hosttarget import HostTarget
-from .timed_message import TimedMessage
+import importlib
+
+# Attribute -> module it comes from. Modules are only imported upon first use of one of their attributes (PEP 562),
+# so importing a model like class:Message: does not import class:Bot: and everything it uses.
+_lazy = {
+    "Bot": "bot",
+    "Command": "command",
+    "Event": "event",
+    "Message": "message",
+    "Info": "message",
+    "UserNotice": "usernotice",
+    "Sub": "usernotice",
+    "ReSub": "usernotice",
+    "SubGift": "usernotice",
+    "AnonSubGift": "usernotice",
+    "Raid": "usernotice",
+    "Ritual": "usernotice",
+    "Charity": "usernotice",
+    "SubMysteryGift": "usernotice",
+    "UserState": "userstate",
+    "GlobalUserState": "userstate",
+    "JoinChannel": "join_channel",
+    "JoinChatRoom": "join_chatroom",
+    "RoomState": "roomstate",
+    "PartChannel": "part_channel",
+    "Mode": "jtv_mode",
+    "Cooldown": "cooldown",
+    "CommandError": "errors",
+    "CooldownError": "errors",
+    "ConcurrencyError": "errors",
+    "SilencedError": "errors",
+    "DecoratorError": "errors",
+    "CogError": "errors",
+    "EventError": "errors",
+    "TimedMessageError": "errors",
+    "CommonError": "errors",
+    "WatchdogError": "errors",
+    "ClearMsg": "clearmsg",
+    "ClearChat": "clearchat",
+    "Ban": "clearchat",
+    "Notice": "general_notice",
+    "HostTarget": "hosttarget",
+    "TimedMessage": "timed_message",
+    "ChatCounter": "chat_counter",
+    "RunningHandler": "running_handler",
+    "Listener": "listener",
+    "Check": "check",
+    "PrefixMatcher": "prefix_matcher",
+    "Quota": "quota",
+    "MessageBatch": "message_batch",
+    "User": "converters",
+    "Rest": "converters",
+    "RoleCache": "role_cache",
+    "Stats": "stats",
+    "CommandStats": "stats",
+    "ResponseCache": "response_cache",
+    "CommandMeta": "command_meta",
+    "Diagnostics": "diagnostics",
+}
+
+__all__ = list(_lazy)
+
+
+def __getattr__(name):
+    module = _lazy.get(name)
+    if module is None:
+        # Submodules (twitchircpy.bot, twitchircpy.message, ...) are attributes once imported, like before.
+        if not name.startswith("_"):
+            try:
+                return importlib.import_module(f"{__name__}.{name}")
+            except ModuleNotFoundError as e:
+                if e.name != f"{__name__}.{name}":
+                    raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache on the package so the next lookup is a plain attribute.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
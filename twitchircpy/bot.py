@@ -1,14 +1,21 @@
 import socket
 import importlib
+import importlib.util
 import inspect
+import os
 import warnings
 import threading
 import sys
 import re
 import time
 import signal
-import datetime
-from functools import wraps
+import itertools
+import heapq
+import math
+import random
+import typing
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 from .command import Command
 from .event import Event
@@ -21,44 +28,158 @@ from .join_chatroom import JoinChatRoom
 from .part_channel import PartChannel
 from .jtv_mode import Mode
 from .cooldown import Cooldown
-from .errors import CommandError, CooldownError, SilencedError, DecoratorError, CogError, EventError, CommonError, TimedMessageError
+from .errors import CommandError, CooldownError, ConcurrencyError, SilencedError, DecoratorError, CogError, EventError, CommonError, TimedMessageError, WatchdogError
 from .clearchat import ClearChat, Ban
 from .clearmsg import ClearMsg
 from .general_notice import Notice
 from .hosttarget import HostTarget
 from .timed_message import TimedMessage
+from .chat_counter import ChatCounter
+from .running_handler import RunningHandler
+from .listener import Listener
+from .message_batch import MessageBatch
+from .check import Check
+from .prefix_matcher import PrefixMatcher
+from .quota import Quota
+from .converters import Rest
+from .role_cache import RoleCache
+from .stats import Stats
+from .response_cache import ResponseCache
+from .command_meta import CommandMeta
+from .diagnostics import Diagnostics, logger
 
 ###################################
 #            DECORATORS           #
 ###################################
 
 
+def _meta(func):
+    # Every decorator writes into the same record, created by whichever runs first.
+    meta = func.__dict__.get("_meta")
+    if meta is None:
+        meta = func._meta = CommandMeta()
+    return meta
+
+
 def command(func):
     """
     This decorator is for marking specific functions as a command.
     """
 
-    func._decorators = "command"
+    _meta(func).kind = "command"
+    return func
+
+
+def group(func):
+    """
+    This decorator is for marking specific functions as a command group.
+    \nGroups work like commands, but the first argument is looked up in the group's subcommands first. The group itself runs if no subcommand matched.
+    \nThe checks and cooldown of a group also apply to its subcommands. Group checks are then called with the cog and info only.
+    """
+
+    meta = _meta(func)
+    meta.group = True
+    if meta.kind != "subcommand":
+        meta.kind = "command"
     return func
 
 
-def cooldown(time):
+def subcommand(parent, name=None):
+    """
+    This decorator is for marking specific functions as a subcommand of the group named {parent}.
+    \nNested groups are given as a space separated path, like "queue admin".
+    \nThe name of the subcommand is the name of the function, unless {name} is given.
+    """
+
+    def _dec_subcommand(func):
+        if not isinstance(parent, str) or not parent.strip():
+            warnings.warn("Subcommand parent must be the name of a group.")
+            return
+        meta = _meta(func)
+        meta.kind = "subcommand"
+        meta.parent = parent.split()
+        meta.name = name
+        return func
+    return _dec_subcommand
+
+
+def cooldown(time, scope="channel"):
     """
     This decorator is for allowing commands to have a cooldown.
+    \nThe scope can be "channel" (default), "user" (per user in each channel) or "global" (across every channel).
     """
 
     def _dec_cooldown(func):
-        if not isinstance(time, int):
-            warnings.warn("Cooldown must be an int.")
+        if not isinstance(time, (int, float)):
+            warnings.warn("Cooldown must be an int or a float.")
             return
         if time > 86400:
             warnings.warn("Cooldown must be less than 86400.")
             return
-        func._cooldown = time
+        if scope not in ("channel", "user", "global"):
+            warnings.warn("Cooldown scope must be \"channel\", \"user\" or \"global\".")
+            return
+        meta = _meta(func)
+        meta.cooldown = time
+        meta.cooldown_scope = scope
         return func
     return _dec_cooldown
 
 
+def budget(seconds):
+    """
+    This decorator is for giving a command its own time budget for the watchdog.
+    """
+
+    def _dec_budget(func):
+        if not isinstance(seconds, (int, float)) or seconds <= 0:
+            warnings.warn("Budget must be a positive number of seconds.")
+            return
+        _meta(func).budget = seconds
+        return func
+    return _dec_budget
+
+
+def concurrency(limit=None, dedupe=False):
+    """
+    This decorator is for limiting how many times a command can be running at once.
+    \nOnly matters when the watchdog runs commands on its workers, since commands otherwise run one at a time on the reader thread.
+    \nWith {dedupe}, using the command with the same channel and arguments while it is already running gets rejected.
+    """
+
+    def _dec_concurrency(func):
+        if limit is not None and (not isinstance(limit, int) or limit <= 0):
+            warnings.warn("Concurrency limit must be a positive integer.")
+            return
+        meta = _meta(func)
+        meta.max_concurrency = limit
+        meta.dedupe = dedupe
+        return func
+    return _dec_concurrency
+
+
+def cached(ttl, key=None, maxsize=256):
+    """
+    This decorator is for reusing the response of a command for {ttl} seconds.
+    \nThe command has to return its response as a string instead of sending it, the class:Bot: sends it to the channel.
+    \nResponses are cached per channel and arguments by default. Give {key} a function (called with info and the arguments) to change that.
+    \nUsers using the command while the response is being worked out wait for that response instead of running the command again.
+    """
+
+    def _dec_cached(func):
+        if not isinstance(ttl, (int, float)) or ttl <= 0:
+            warnings.warn("Cache ttl must be a positive number of seconds.")
+            return
+        if key is not None and not callable(key):
+            warnings.warn("Cache key must be a function.")
+            return
+        meta = _meta(func)
+        meta.cache = ResponseCache(ttl, maxsize)
+        meta.cache_key = key
+        return func
+    return _dec_cached
+
+
 def aliases(a):
     """
     This decorator is for allowing commands to have aliases.
@@ -68,32 +189,26 @@ def aliases(a):
         if not isinstance(a, list):
             warnings.warn("Aliases must be a list.")
             return
-        func._aliases = a
+        _meta(func).aliases = a
         return func
     return _dec_aliases
 
 
+def _add_check(func, check):
+    # Checks are only stored on the function, they get compiled into one callable when the command is added.
+    # Insert at the start so the outermost decorator runs first.
+    _meta(func).checks.insert(0, check)
+    return func
+
+
 def ismoderator(func):
     """
     This decorator is for allowing only moderators (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_ismod(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "moderator/1" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a mod. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a mod. Command used: {func.__name__}"))
-            return
-    return _dec_ismod
+    return _add_check(func, Check("ismoderator", None,
+                                  "Command check failed, {user} was not a mod. Command used: {command}",
+                                  frozenset(["moderator", "broadcaster"])))
 
 
 def issubscriber(func):
@@ -101,28 +216,9 @@ def issubscriber(func):
     This decorator is for allowing only subscribers (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_issub(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                try:
-                    badges = dict(item.split("/")
-                                  for item in args[1].badges.split(","))
-                except ValueError:
-                    pass
-                else:
-                    if ("subscriber" in badges and int(badges["subscriber"]) > 0) or ("broadcaster" in badges and badges["broadcaster"] == "1"):
-                        return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a subscriber. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a subscriber. Command used: {func.__name__}"))
-            return
-    return _dec_issub
+    return _add_check(func, Check("issubscriber", None,
+                                  "Command check failed, {user} was not a subscriber. Command used: {command}",
+                                  frozenset(["subscriber", "broadcaster"])))
 
 
 def isbroadcaster(func):
@@ -130,22 +226,9 @@ def isbroadcaster(func):
     This decorator is for allowing only the broadcaster to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_isbroadcaster(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not the broadcaster. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not the broadcaster. Command used: {func.__name__}"))
-            return
-    return _dec_isbroadcaster
+    return _add_check(func, Check("isbroadcaster", None,
+                                  "Command check failed, {user} was not the broadcaster. Command used: {command}",
+                                  frozenset(["broadcaster"])))
 
 
 def isbits(func):
@@ -153,22 +236,9 @@ def isbits(func):
     This decorator is for allowing only users that cheer within the command (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_isbits(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "bits/" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} did not include bits. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} did not include bits. Command used: {func.__name__}"))
-            return
-    return _dec_isbits
+    return _add_check(func, Check("isbits", None,
+                                  "Command check failed, {user} did not include bits. Command used: {command}",
+                                  frozenset(["bits", "broadcaster"])))
 
 
 def isadmin(func):
@@ -176,22 +246,9 @@ def isadmin(func):
     This decorator is for allowing only admins (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_isadmin(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "admin/1" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not an admin. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not an admin. Command used: {func.__name__}"))
-            return
-    return _dec_isadmin
+    return _add_check(func, Check("isadmin", None,
+                                  "Command check failed, {user} was not an admin. Command used: {command}",
+                                  frozenset(["admin", "broadcaster"])))
 
 
 def isglobalmod(func):
@@ -199,22 +256,9 @@ def isglobalmod(func):
     This decorator is for allowing only global moderators (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_isglobalmod(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "global_mod/1" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a global mod. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a global mod. Command used: {func.__name__}"))
-            return
-    return _dec_isglobalmod
+    return _add_check(func, Check("isglobalmod", None,
+                                  "Command check failed, {user} was not a global mod. Command used: {command}",
+                                  frozenset(["global_mod", "broadcaster"])))
 
 
 def isstaff(func):
@@ -222,22 +266,9 @@ def isstaff(func):
     This decorator is for allowing only staff (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_isstaff(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "staff/1" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a staff member. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not a staff member. Command used: {func.__name__}"))
-            return
-    return _dec_isstaff
+    return _add_check(func, Check("isstaff", None,
+                                  "Command check failed, {user} was not a staff member. Command used: {command}",
+                                  frozenset(["staff", "broadcaster"])))
 
 
 def isturbo(func):
@@ -246,22 +277,9 @@ def isturbo(func):
     Note, this does not work for Prime members.
     """
 
-    @wraps(func)
-    def _dec_isturbo(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "turbo/1" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not turbo. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not turbo. Command used: {func.__name__}"))
-            return
-    return _dec_isturbo
+    return _add_check(func, Check("isturbo", None,
+                                  "Command check failed, {user} was not turbo. Command used: {command}",
+                                  frozenset(["turbo", "broadcaster"])))
 
 
 def isvip(func):
@@ -269,22 +287,9 @@ def isvip(func):
     This decorator is for allowing only VIP members (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_isvip(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "vip/1" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not VIP. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not VIP. Command used: {func.__name__}"))
-            return
-    return _dec_isvip
+    return _add_check(func, Check("isvip", None,
+                                  "Command check failed, {user} was not VIP. Command used: {command}",
+                                  frozenset(["vip", "broadcaster"])))
 
 
 def ispremium(func):
@@ -292,22 +297,9 @@ def ispremium(func):
     This decorator is for allowing only premium (Prime) members (and the broadcaster) to use the specific command.
     """
 
-    @wraps(func)
-    def _dec_ispremium(*args, **kwargs):
-        if len(args) > 1:
-            if isinstance(args[1], Info):
-                if "premium/1" in args[1].badges or "broadcaster/1" in args[1].badges:
-                    return func(*args, **kwargs)
-        if len(args) > 1:
-            if inspect.isclass(type(args[0])):
-                if not isinstance(args[0], Bot):
-                    args[0].bot._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not premium. Command used: {func.__name__}"))
-                else:
-                    args[0]._call_event("on_error", DecoratorError(
-                        func, f"Command check failed, {args[1].display_name} was not premium. Command used: {func.__name__}"))
-            return
-    return _dec_ispremium
+    return _add_check(func, Check("ispremium", None,
+                                  "Command check failed, {user} was not premium. Command used: {command}",
+                                  frozenset(["premium", "broadcaster"])))
 
 
 def check(check_func):
@@ -319,53 +311,31 @@ def check(check_func):
     """
 
     def _func_check(func):
-        @wraps(func)
-        def _dec_check(*args, **kwargs):
-            if not inspect.isfunction(check_func):
-                if len(args) > 1 and inspect.isclass(type(args[0])):
-                    if not isinstance(args[0], Bot):
-                        args[0].bot._call_event("on_error", DecoratorError(
-                            func, f"@bot.check() has to have a function as a parameter."))
-                    else:
-                        args[0]._call_event("on_error", DecoratorError(
-                            func, f"@bot.check() has to have a function as a parameter."))
-                return
-            try:
-                func_val = check_func(*args, **kwargs)
-            except Exception as e:
-                if len(args) > 1 and inspect.isclass(type(args[0])):
-                    if not isinstance(args[0], Bot):
-                        args[0].bot._call_event("on_error", DecoratorError(
-                            func, f"@bot.check() tried to call the function: {check_func.__name__} but the function raised this exception: {e}."))
-                    else:
-                        args[0]._call_event("on_error", DecoratorError(
-                            func, f"@bot.check() tried to call the function: {check_func.__name__} but the function raised this exception: {e}."))
-                return
-            else:
-                if func_val is False:
-                    if len(args) > 1 and inspect.isclass(type(args[0])):
-                        if not isinstance(args[0], Bot):
-                            args[0].bot._call_event("on_error", DecoratorError(
-                                func, f"Command check failed. User {args[1].display_name} failed the check: {check_func.__name__}. Command used: {func.__name__}"))
-                        else:
-                            args[0]._call_event("on_error", DecoratorError(
-                                func, f"Command check failed. User {args[1].display_name} failed the check: {check_func.__name__}. Command used: {func.__name__}"))
-                    return
-                elif func_val is True:
-                    return func(*args, **kwargs)
-                else:
-                    if len(args) > 1 and inspect.isclass(type(args[0])):
-                        if not isinstance(args[0], Bot):
-                            args[0].bot._call_event("on_error", DecoratorError(
-                                func, f"The return function for @bot.check() needs to return either True or False. Return function name: {check_func.__name__}."))
-                        else:
-                            args[0]._call_event("on_error", DecoratorError(
-                                func, f"The return function for @bot.check() needs to return either True or False. Return function name: {check_func.__name__}."))
-                    return
-        return _dec_check
+        if not inspect.isfunction(check_func):
+            # Keep the command unusable, the same as a check which always fails.
+            return _add_check(func, Check("check", lambda *args: False,
+                                          "@bot.check() has to have a function as a parameter."))
+        return _add_check(func, Check(check_func.__name__, check_func,
+                                      "Command check failed. User {user} failed the check: {check}. Command used: {command}"))
     return _func_check
 
 
+# Cog class -> [(name, function, meta)] of its commands, so re-adding a cog does not inspect the class again.
+_class_commands = weakref.WeakKeyDictionary()
+
+
+def _get_class_commands(cls):
+    commands = _class_commands.get(cls)
+    if commands is None:
+        commands = []
+        for name, function in inspect.getmembers(cls, inspect.isfunction):
+            meta = getattr(function, "_meta", None)
+            if meta is not None and meta.kind is not None:
+                commands.append((name, function, meta))
+        _class_commands[cls] = commands
+    return commands
+
+
 class Bot():
 
     """
@@ -382,8 +352,9 @@ class Bot():
         Note, this is not an actual OAuth token.
     nick -> :str:
         The nickname (nick) must be the Twitch account username/handle.
-    prefix -> :str:
+    prefix -> :str: | :list<str>:
         The prefix is used for commands.
+        :list<str>: for multiple prefixes.
         Mandatory since there is no default prefix.
     channel -> :str: | :list<str>:
         Channel is the username(s) of the Twitch channel(s) to join.
@@ -394,12 +365,15 @@ class Bot():
         Also for responding to Twitch's IRC Reconnect.
         This should be True on most occasions.
         Could be False if using temporarily.
+    mention_prefix -> Optional[:bool:]
+        Whether or not mentioning the bot ("@nick command") can be used as a prefix.
+        False by default.
     """
 
-    def __init__(self, oauth, nick, prefix, channel, reconnect):
+    def __init__(self, oauth, nick, prefix, channel, reconnect, mention_prefix=False):
         # Check if the required types are given.
-        if not isinstance(prefix, str):
-            raise TypeError("Prefix must be a string.")
+        if not self._check_prefix(prefix):
+            raise TypeError("Prefix must be a string or a list of strings.")
         if not isinstance(oauth, str):
             raise TypeError("OAuth must be a string.")
         if not isinstance(channel, str) and not isinstance(channel, list):
@@ -415,22 +389,77 @@ class Bot():
         self.nick = nick.lower()
         self.channels = [channel] if isinstance(channel, str) else channel
         self.reconnect = reconnect
+        self.mention_prefix = mention_prefix
+        self._channel_prefixes = {}
+        self._prefix_cache = {}
         self.cogs = []
+        # Module name -> placeholder commands of lazy cogs which have not been imported yet.
+        self._lazy_cogs = {}
+        self._cog_lock = threading.RLock()
+        # Set while a reloaded cog is being set up, so its commands are built off to the side.
+        self._staging = threading.local()
+        self._cog_mtimes = {}
+        self._cog_watch_interval = None
+        self._cog_watcher_enabled = False
         self.commands = []
+        self._command_index = {}
+        self._command_ids = itertools.count()
         self.silenced_commands = []
         self.events = []
         self._callbacks = {}
-        self.cooldowns = []
-        self.timed_messages = []
+        self._listeners = {}
+        self._waiters = {}
+        self._waiters_lock = threading.RLock()
+        self.cooldowns = {}
+        self._cooldown_sweep_at = 64
+        self.quotas = []
+        # (name, channel) -> TimedMessage, in the order they were added.
+        self._timed_messages = {}
+        # channel -> [chats, timed messages, chat rate, chats when sampled, time sampled], shared by the timed messages of the channel.
+        self._chat_counters = {}
         self._builtin_commands = []
+        self._builtin_index = {}
+        self._middleware = []
+        self.roles = RoleCache()
+        self.stats = Stats()
+        self.diagnostics = Diagnostics()
+        self._user_id = None
+        self.quarantined = set()
+        self._violations = {}
+        self._handler_budgets = {}
+        self._running_handlers = {}
+        self._handler_tokens = itertools.count()
+        self._handler_budget = None
+        self._quarantine_after = None
+        self._watchdog_interval = None
+        self._watchdog_enabled = False
+        self._executor = None
         self._timed_messages_enabled = False
+        self._timer_heap = []
+        self._timer_ids = itertools.count()
+        self._timer_condition = threading.Condition()
+        self._timed_message_jitter = 0
+        self._chat_rate_window = 60
+        self.send_budget = None
+        self._send_reserve = 0
+        self._send_lock = threading.Lock()
+        self._batches = {}
+        self._batch_size = None
+        self._batch_interval = None
+        self._batching_enabled = False
+        self._batch_condition = threading.Condition()
+        self._running_commands = {}
+        self._inflight_commands = set()
+        self._concurrency_lock = threading.Lock()
         self._socket = None
         self._read_buffer = ""
         self._RECV_AMOUNT = 1024
         self.running = False
         self._thread = None
-        self._cd_thread = None
         self._td_thread = None
+        self._mb_thread = None
+        self._wd_thread = None
+        self._cw_thread = None
 
         self.channels = [channel.lower() for channel in self.channels]
 
@@ -450,10 +479,16 @@ class Bot():
 
     @prefix.setter
     def prefix(self, p):
-        if not isinstance(p, str):
-            warnings.warn("Prefix has to be a string.")
+        if not self._check_prefix(p):
+            warnings.warn("Prefix has to be a string or a list of strings.")
             return
         self._prefix = p
+        self.invalidate_prefix()
+
+    def _check_prefix(self, p):
+        if isinstance(p, list):
+            return len(p) > 0 and all(isinstance(i, str) for i in p)
+        return isinstance(p, str)
 
     ###################################
     #             SOCKET              #
@@ -557,26 +592,151 @@ class Bot():
 
         self.running = True
         self._thread = threading.Thread(target=self._run)
-        self._cd_thread = threading.Thread(target=self._run_cooldown)
         self._thread.start()
-        self._cd_thread.start()
 
         # Make a signal handler to mainly stop CTRL + C causing errors.
         signal.signal(signal.SIGINT, self._signal_handler)
 
-    def start_timed_messages(self):
+    def start_timed_messages(self, jitter=0, rate_window=60):
         """
         This method is used to allow the class:Bot: to be able to use timed messages.
         \nUse this method before "add_timed_message" else it will error.
+        \nThe {jitter} (a fraction of the time, like 0.1 for 10%) randomly spreads timed messages with the same time so they do not all fire at once.
+        \nThe {rate_window} is how many seconds of chat the chat rate of adaptive timed messages is averaged over.
         \nTo stop using timed messages, use "stop_timed_messages".
         """
 
+        if not isinstance(jitter, (int, float)) or not 0 <= jitter < 1:
+            warnings.warn("Jitter must be a number from 0 up to (not including) 1.")
+            return
+        if not isinstance(rate_window, (int, float)) or rate_window <= 0:
+            warnings.warn("Rate window must be a positive number of seconds.")
+            return
+
+        self._timed_message_jitter = jitter
+        self._chat_rate_window = rate_window
         self._td_thread = threading.Thread(target=self._run_timed_messages)
         # Need self.running = True in both this and run so it runs if called before bot.run()
         self.running = True
         self._timed_messages_enabled = True
         self._td_thread.start()
 
+    def start_message_batching(self, size=100, interval=1000):
+        """
+        This method is used to allow the class:Bot: to fire the "on_message_batch" event.
+        \nMessages are grouped by channel and sent once {size} messages arrived or {interval} milliseconds passed since the first one.
+        \nThe "on_message" event still fires for every message.
+        \nTo stop batching messages, use "stop_message_batching".
+        """
+
+        if not isinstance(size, int) or size <= 0:
+            warnings.warn("Batch size has to be a positive integer.")
+            return
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            warnings.warn("Batch interval has to be a positive number of milliseconds.")
+            return
+
+        self._batch_size = size
+        self._batch_interval = interval / 1000
+        if self._batching_enabled:
+            return
+
+        self._mb_thread = threading.Thread(target=self._run_message_batches)
+        # Need self.running = True in both this and run so it runs if called before bot.run()
+        self.running = True
+        self._batching_enabled = True
+        self._mb_thread.start()
+
+    def stop_message_batching(self):
+        """
+        This method is for disabling the "on_message_batch" event.
+        \nAny messages still waiting in a batch are sent before stopping.
+        """
+
+        with self._batch_condition:
+            self._batching_enabled = False
+            self._batch_condition.notify()
+
+    def start_watchdog(self, budget=5, interval=0.5, quarantine_after=3, workers=None):
+        """
+        This method is used to allow the class:Bot: to watch how long commands and events take.
+        \nA handler running for longer than {budget} seconds fires "on_error" with a class:WatchdogError:.
+        \nAfter {quarantine_after} violations, the handler gets quarantined and will not fire until "unquarantine" is used.
+        \nIf {workers} is given, commands and events run in a thread pool of that size so a hanging handler cannot freeze the bot.
+        Handlers going over budget are then abandoned.
+        \nPer-command budgets can be set with the "budget" decorator and per-event budgets with "@bot.event(budget=...)".
+        """
+
+        if not isinstance(budget, (int, float)) or budget <= 0:
+            warnings.warn("Budget has to be a positive number of seconds.")
+            return
+        if not isinstance(quarantine_after, int) or quarantine_after <= 0:
+            warnings.warn("quarantine_after has to be a positive integer.")
+            return
+
+        self._handler_budget = budget
+        self._watchdog_interval = interval
+        self._quarantine_after = quarantine_after
+        if workers and not self._executor:
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="twitchircpy")
+        if self._watchdog_enabled:
+            return
+
+        self._wd_thread = threading.Thread(target=self._run_watchdog)
+        # Need self.running = True in both this and run so it runs if called before bot.run()
+        self.running = True
+        self._watchdog_enabled = True
+        self._wd_thread.start()
+
+    def stop_watchdog(self):
+        """
+        This method is for stopping the watchdog.
+        \nHandlers will run on the reading thread again.
+        """
+
+        self._watchdog_enabled = False
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def start_cog_watcher(self, interval=0.5):
+        """
+        This method is used to allow the class:Bot: to reload cogs as soon as their file changes.
+        \nThe files of the added cogs are checked every {interval} seconds, and only the changed cogs get reloaded (like with "reload_cog").
+        \nTo stop watching cogs, use "stop_cog_watcher".
+        """
+
+        if not isinstance(interval, (int, float)) or interval <= 0:
+            warnings.warn("Interval has to be a positive number of seconds.")
+            return
+
+        self._cog_watch_interval = interval
+        if self._cog_watcher_enabled:
+            return
+
+        self._cog_mtimes = {}
+        self._cw_thread = threading.Thread(target=self._run_cog_watcher)
+        # Need self.running = True in both this and run so it runs if called before bot.run()
+        self.running = True
+        self._cog_watcher_enabled = True
+        self._cw_thread.start()
+
+    def stop_cog_watcher(self):
+        """
+        This method is for stopping the cog watcher.
+        """
+
+        self._cog_watcher_enabled = False
+
+    def unquarantine(self, function):
+        """
+        This method is for allowing a quarantined command or event function to fire again.
+        """
+
+        self.quarantined.discard(function)
+        self._violations.pop(function, None)
+
     def _signal_handler(self, sig, frame):
         self.stop()
 
@@ -588,33 +748,214 @@ class Bot():
                 for line in temp:
                     self._main_read(line)
 
-    def _run_cooldown(self):
-        while self.running:
-            time.sleep(1)
-            removed = []
+    def _run_cog_watcher(self):
+        while self.running and self._cog_watcher_enabled:
+            for cog in list(self.cogs):
+                path = getattr(cog, "__file__", None)
+                if not path:
+                    continue
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
 
-            for cooldown in self.cooldowns:
-                cooldown.time -= 1
-                if cooldown.time <= 0:
-                    removed.append(cooldown)
+                previous = self._cog_mtimes.get(cog.__name__)
+                self._cog_mtimes[cog.__name__] = mtime
+                if previous is not None and previous != mtime:
+                    self._swap_cog(cog.__name__)
 
-            for remove in removed:
-                self.cooldowns.remove(remove)
+            time.sleep(self._cog_watch_interval)
 
     def _run_timed_messages(self):
         while self.running and self._timed_messages_enabled:
-            time.sleep(1)
-
-            for message in self.timed_messages:
-                if time.time() - message.last_called > message.time:
+            due = []
+            with self._timer_condition:
+                now = time.monotonic()
+                while self._timer_heap:
+                    deadline, _, message = self._timer_heap[0]
+                    # Entries of removed or rescheduled timed messages are dropped lazily.
+                    if deadline != message.deadline:
+                        heapq.heappop(self._timer_heap)
+                        continue
+                    if deadline > now:
+                        break
+                    heapq.heappop(self._timer_heap)
+                    due.append(message)
+
+                if not due:
+                    # Sleeps until the next deadline, woken early by "add_timed_message" and "remove_timed_message".
+                    wait = self._timer_heap[0][0] - now if self._timer_heap else None
+                    self._timer_condition.wait(wait)
+                    continue
+
+                for message in due:
+                    self._schedule_timed_message(
+                        message, self._timed_message_delay(message))
+
+            for message in due:
+                if message.current_chats < message.required_chats:
                     message.last_called = time.time()
-                    if message.current_chats >= message.required_chats:
-                        try:
-                            message.function(self, message)
-                        except Exception as e:
-                            self._call_event("on_error", TimedMessageError(
-                                message.name, f"Error when calling timed_message. Error: {e}"))
-                        message.current_chats = 0
+                    continue
+
+                # Put the message off while the send budget is down to what is kept for commands.
+                wait = self._send_budget_wait()
+                if wait:
+                    with self._timer_condition:
+                        if message.deadline is not None:
+                            self._schedule_timed_message(message, wait)
+                    continue
+
+                message.last_called = time.time()
+                try:
+                    message.function(self, message)
+                except Exception as e:
+                    self._call_event("on_error", TimedMessageError(
+                        message.name, f"Error when calling timed_message. Error: {e}"))
+                message.current_chats = 0
+
+    def _timed_message_delay(self, message, adapt=True):
+        delay = self._adaptive_time(message) if message.adaptive and adapt else message.time
+        jitter = message.jitter if message.jitter is not None else self._timed_message_jitter
+        if not jitter:
+            return delay
+        return delay * random.uniform(1 - jitter, 1 + jitter)
+
+    def _adaptive_time(self, message):
+        # The chat rate is only sampled here, when an adaptive timed message is attempted, so chats only cost the counter increment.
+        counter = message._counter
+        now = time.monotonic()
+        elapsed = now - counter.sampled_at
+        if elapsed > 0:
+            # Exponential moving average weighted by the time since the last sample, so uneven sampling does not skew it.
+            weight = 1 - math.exp(-elapsed / self._chat_rate_window)
+            counter.rate += weight * ((counter.chats - counter.sampled_chats) / elapsed - counter.rate)
+            counter.sampled_chats = counter.chats
+            counter.sampled_at = now
+
+        if counter.rate <= 0:
+            return message.max_time
+        return min(message.max_time, max(message.min_time, message.required_chats / counter.rate))
+
+    def _schedule_timed_message(self, message, delay):
+        # Has to be called with the timer condition held.
+        message.deadline = time.monotonic() + delay
+        heapq.heappush(self._timer_heap, (message.deadline, next(self._timer_ids), message))
+
+    def _run_message_batches(self):
+        while self.running and self._batching_enabled:
+            due = []
+            with self._batch_condition:
+                now = time.monotonic()
+                wait = self._batch_interval
+                for channel, batch in list(self._batches.items()):
+                    remaining = batch.created + self._batch_interval - now
+                    if remaining <= 0:
+                        due.append(batch)
+                        del self._batches[channel]
+                    else:
+                        wait = min(wait, remaining)
+                if not due:
+                    self._batch_condition.wait(wait)
+                    continue
+
+            for batch in due:
+                self._call_event("on_message_batch", batch)
+
+        # Flush whatever is left so no messages are lost when stopping.
+        with self._batch_condition:
+            due = list(self._batches.values())
+            self._batches = {}
+        for batch in due:
+            self._call_event("on_message_batch", batch)
+
+    def _run_watchdog(self):
+        while self.running and self._watchdog_enabled:
+            time.sleep(self._watchdog_interval)
+            now = time.monotonic()
+            for token, running in list(self._running_handlers.items()):
+                # Queued handlers have not started, so waiting for a worker does not count against them.
+                if running.started is None:
+                    continue
+                if not running.reported and now - running.started > running.budget:
+                    running.reported = True
+                    if running.future:
+                        # Cannot stop a running thread, so abandon it and stop it from starting if queued.
+                        running.future.cancel()
+                        self._running_handlers.pop(token, None)
+                    self._report_overrun(running.handler, now - running.started, running.budget,
+                                         "abandoned" if running.future else "still running")
+
+    def _report_overrun(self, handler, elapsed, budget, state):
+        violations = self._violations.get(handler, 0) + 1
+        self._violations[handler] = violations
+        quarantined = violations >= self._quarantine_after
+        if quarantined:
+            self.quarantined.add(handler)
+
+        name = getattr(handler, "__qualname__", handler)
+        self._call_event("on_error", WatchdogError(handler, elapsed, budget, violations, quarantined,
+                                                   f"Handler {name} went over its budget of {budget} seconds ({state} after {elapsed:.3f} seconds)."
+                                                   + (" It has been quarantined." if quarantined else "")))
+
+    def _call_handler(self, function, args, background=True, budget=None):
+        if not self._watchdog_enabled:
+            return function(*args)
+        return self._invoke(function, function, args, budget, background)
+
+    def _invoke(self, handler, function, args, budget=None, background=True, done=None):
+        # {done} is called once the handler finished, or will never run (quarantined, cancelled or not submitted).
+        if handler in self.quarantined:
+            if done is not None:
+                done()
+            return None
+        if budget is None:
+            budget = self._handler_budgets.get(handler, self._handler_budget)
+
+        token = next(self._handler_tokens)
+        if background and self._executor:
+            # The start time is set by the worker once the handler actually starts.
+            running = RunningHandler(handler, budget)
+            self._running_handlers[token] = running
+            try:
+                running.future = self._executor.submit(
+                    self._run_handler, token, function, args)
+            except RuntimeError:
+                # The executor got shut down by "stop_watchdog" or "stop".
+                self._running_handlers.pop(token, None)
+                if done is not None:
+                    done()
+                return None
+            if done is not None:
+                # Done callbacks also run for jobs cancelled before they started.
+                running.future.add_done_callback(lambda future: done())
+            return True
+
+        self._running_handlers[token] = RunningHandler(handler, budget, time.monotonic())
+        try:
+            return function(*args)
+        finally:
+            self._finish_handler(token)
+            if done is not None:
+                done()
+
+    def _run_handler(self, token, function, args):
+        running = self._running_handlers.get(token)
+        if running is not None:
+            running.started = time.monotonic()
+        try:
+            function(*args)
+        except Exception as e:
+            self._call_event("on_error", CommonError(
+                f"Handler {getattr(function, '__qualname__', function)} raised an exception: {e}"))
+        finally:
+            self._finish_handler(token)
+
+    def _finish_handler(self, token):
+        running = self._running_handlers.pop(token, None)
+        if running and not running.reported and running.started is not None:
+            elapsed = time.monotonic() - running.started
+            if elapsed > running.budget:
+                self._report_overrun(running.handler, elapsed, running.budget, "finished")
 
     def stop(self):
         """
@@ -622,6 +963,12 @@ class Bot():
         """
 
         self.running = False
+        if self._executor:
+            self._executor.shutdown(wait=False)
+        with self._batch_condition:
+            self._batch_condition.notify()
+        with self._timer_condition:
+            self._timer_condition.notify()
         self._socket.close()
 
     ###################################
@@ -635,17 +982,22 @@ class Bot():
         """
 
         self._timed_messages_enabled = False
+        with self._timer_condition:
+            self._timer_condition.notify()
 
-    def _check_for_timed_message(self, name, channel):
-        for tm in self.timed_messages:
-            if tm.name == name and tm.channel == channel:
-                return True
+    @property
+    def timed_messages(self):
+        return list(self._timed_messages.values())
 
-        return False
+    def _check_for_timed_message(self, name, channel):
+        return (name, channel) in self._timed_messages
 
-    def add_timed_message(self, name, required_chats, channel, time, function):
+    def add_timed_message(self, name, required_chats, channel, time, function, offset=None, jitter=None, adaptive=False, min_time=None, max_time=None):
         """
         This method is to add a timed message to the class:Bot:.
+        \nThe {offset} is the seconds to wait before the first attempt (instead of {time}), for spreading timed messages across their time.
+        \nThe {jitter} overrides the jitter given to "start_timed_messages" for this timed message.
+        \nAdaptive timed messages attempt more often in busy chats and less often in quiet ones, aiming for once every {required_chats} chats within {min_time} and {max_time} seconds.
         """
 
         if not self._timed_messages_enabled:
@@ -658,31 +1010,73 @@ class Bot():
                 None, "Function must be a function or a method (class function)."))
             return
 
+        if offset is not None and (not isinstance(offset, (int, float)) or offset < 0):
+            self._call_event("on_error", TimedMessageError(
+                None, "Offset must be a positive number of seconds."))
+            return
+
+        if jitter is not None and (not isinstance(jitter, (int, float)) or not 0 <= jitter < 1):
+            self._call_event("on_error", TimedMessageError(
+                None, "Jitter must be a number from 0 up to (not including) 1."))
+            return
+
+        for bound in (min_time, max_time):
+            if bound is not None and (not isinstance(bound, (int, float)) or bound <= 0):
+                self._call_event("on_error", TimedMessageError(
+                    None, "Minimum and maximum times must be positive numbers of seconds."))
+                return
+
         if self._check_for_timed_message(name, channel):
             self._call_event("on_error", TimedMessageError(
                 None, f"Timed Message with name: \"{name}\" already exists for channel: \"{channel}\"."))
             return
 
-        self.timed_messages.append(TimedMessage(
-            name, required_chats, channel, time, function))
+        # Only both bounds given can conflict, a default is kept within the other bound.
+        if min_time is not None and max_time is not None and min_time > max_time:
+            self._call_event("on_error", TimedMessageError(
+                None, "Minimum time can not be more than the maximum time."))
+            return
+
+        timed_message = TimedMessage(
+            name, required_chats, channel, time, function, offset, jitter, adaptive, min_time, max_time)
+
+        with self._timer_condition:
+            # Looked up under the lock, since "remove_timed_message" drops the counter once its last timed message is removed.
+            counter = self._chat_counters.get(channel)
+            if counter is None:
+                counter = self._chat_counters[channel] = ChatCounter()
+            timed_message._counter = counter
+            timed_message._baseline = counter.chats
+            self._timed_messages[(name, channel)] = timed_message
+            counter.refs += 1
+            # There is no chat rate yet, so the first attempt of adaptive timed messages uses {time}.
+            self._schedule_timed_message(timed_message, offset if offset is not None
+                                         else self._timed_message_delay(timed_message, False))
+            self._timer_condition.notify()
 
     def remove_timed_message(self, name, channel):
         """
         This method is for removing a timed message via a name from the class:Bot:.
         """
 
-        removed = []
-        for tm in self.timed_messages:
-            if tm.name == name and tm.channel == channel:
-                removed.append(tm)
-
-        for remove in removed:
-            self.timed_messages.remove(remove)
+        with self._timer_condition:
+            remove = self._timed_messages.pop((name, channel), None)
+            if remove is None:
+                return
+            remove.deadline = None
+            remove._counter.refs -= 1
+            if not remove._counter.refs:
+                self._chat_counters.pop(channel, None)
+            # Drop the stale entries once most of the heap is stale, otherwise they are skipped when reached.
+            if len(self._timer_heap) > 2 * len(self._timed_messages) + 64:
+                self._timer_heap = [entry for entry in self._timer_heap if entry[0] == entry[2].deadline]
+                heapq.heapify(self._timer_heap)
+            self._timer_condition.notify()
 
     def _handle_timed_messages(self, message):
-        for tm in self.timed_messages:
-            if tm.channel == message.channel:
-                tm.current_chats += 1
+        counter = self._chat_counters.get(message.channel)
+        if counter is not None:
+            counter.chats += 1
 
     ###################################
     #             EVENTS              #
@@ -717,6 +1111,10 @@ class Bot():
         self.events.append(Event(25, "on_charity", 1))
         self.events.append(Event(26, "on_submysterygift", 1))
         self.events.append(Event(27, "command_fired", 2))
+        self.events.append(Event(28, "on_message_batch", 1))
+
+    # Events whose return value is used or which have to fire right away, so they never run in the thread pool.
+    _foreground_events = frozenset(["on_error", "dynamic_prefix"])
 
     def _get_event(self, event_name):
         for event in self.events:
@@ -724,41 +1122,225 @@ class Bot():
                 return event
 
     def _call_event(self, event_name, *args):
+        result = None
         if self._callbacks and event_name in self._callbacks:
-            return self._callbacks[event_name](*args)
+            result = self._call_handler(
+                self._callbacks[event_name], args, event_name not in self._foreground_events)
+        if self._listeners and event_name in self._listeners:
+            filtered = self._call_listeners(event_name, args)
+            if result is None:
+                result = filtered
+        if self._waiters and event_name in self._waiters:
+            self._resolve_waiters(event_name, args)
+        return result
+
+    def _call_listeners(self, event_name, args):
+        index = self._listeners[event_name]
+        background = event_name not in self._foreground_events
+        channel, user, command = self._get_event_keys(args)
+        result = None
+
+        # Only look up the buckets which could match, so the cost grows with the matching listeners.
+        for c in (channel, None) if channel else (None,):
+            for u in (user, None) if user else (None,):
+                for m in (command, None) if command else (None,):
+                    listeners = index.get((c, u, m))
+                    if not listeners:
+                        continue
+                    for listener in listeners:
+                        if listener.predicate and not listener.predicate(*args):
+                            continue
+                        value = self._call_handler(
+                            listener.function, args, background)
+                        if result is None:
+                            result = value
+
+        return result
+
+    def _get_event_keys(self, args):
+        if not args:
+            return None, None, None
+        channel = getattr(args[0], "channel", None)
+        user = getattr(args[0], "user", None)
+        command = args[1].name if len(args) > 1 and isinstance(args[1], Command) else None
+        return channel, user, command
+
+    def _add_listener(self, listener):
+        index = self._listeners.setdefault(listener.event, {})
+        index.setdefault((listener.channel, listener.user,
+                          listener.command), []).append(listener)
+
+    def _resolve_waiters(self, event_name, args):
+        # Reentrant lock since done callbacks run in this thread and are allowed to call "wait_for" again.
+        with self._waiters_lock:
+            waiters = self._waiters.get(event_name)
+            if not waiters:
+                return
+
+            # Iterate over a copy so waiters added by done callbacks wait for the next event.
+            matched = []
+            for waiter in list(waiters):
+                future, predicate = waiter
+                if not future.done():
+                    try:
+                        if predicate and not predicate(*args):
+                            continue
+                    except Exception as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(
+                            None if not args else args[0] if len(args) == 1 else args)
+                matched.append(waiter)
+
+            remaining = [w for w in self._waiters.get(event_name, ())
+                         if w not in matched]
+            if remaining:
+                self._waiters[event_name] = remaining
+            else:
+                self._waiters.pop(event_name, None)
+
+    def _expire_waiter(self, event_name, future):
+        with self._waiters_lock:
+            waiters = self._waiters.get(event_name)
+            if waiters:
+                remaining = [w for w in waiters if w[0] is not future]
+                if remaining:
+                    self._waiters[event_name] = remaining
+                else:
+                    del self._waiters[event_name]
+            if not future.done():
+                future.set_exception(TimeoutError(
+                    f"Timed out waiting for event \"{event_name}\"."))
 
-    def event(self, func):
+    def wait_for(self, event_name, predicate=None, timeout=None):
+        """
+        This method is for waiting until an event fires instead of storing state or polling.
+        \nReturns a :Future: which resolves with the event's argument (a tuple if the event has multiple arguments).
+        \nThe predicate is called with the event's arguments and has to return a truthy value for the future to resolve.
+        \nIf timeout (in seconds) is given, the future raises TimeoutError once it has passed.
+        \nNote, do not block on the future inside of a command or event since they run on the reading thread. Use "add_done_callback" instead.
+        """
+
+        if not self._get_event(event_name):
+            self._call_event("on_error", EventError(
+                event_name, "Cannot wait for an event that does not exist."))
+            return None
+
+        future = Future()
+        with self._waiters_lock:
+            self._waiters.setdefault(event_name, []).append(
+                (future, predicate))
+
+        if timeout is not None:
+            timer = threading.Timer(
+                timeout, self._expire_waiter, (event_name, future))
+            timer.daemon = True
+            timer.start()
+            future.add_done_callback(lambda f: timer.cancel())
+
+        return future
+
+    def event(self, func=None, *, name=None, channel=None, user=None, command=None, predicate=None, budget=None):
         """
         This method is for accessing an event from class:Bot:.
         \nHas to be used as a decorator for a function.
+        \nFilters can be given to only fire the function for specific events. Example:
+        \n@bot.event(channel="jups", user=["a", "b"], predicate=lambda message: message.bits)
+        \nThe "command" filter only applies to events which include a command, like "command_fired".
+        \nUse "name" when the function name is not the name of the event.
+        \nUse "budget" to give the function its own time budget (in seconds) for the watchdog.
         """
 
-        event = self._get_event(func.__name__)
+        if func is None:
+            def _dec_event(f):
+                return self.event(f, name=name, channel=channel, user=user, command=command, predicate=predicate, budget=budget)
+            return _dec_event
+
+        event_name = name if name else func.__name__
+        event = self._get_event(event_name)
+        if not event:
+            logger.warning("Event \"%s\" does not exist.", event_name)
+            return func
+
         event_args = event.args
-        if event:
-            f_args = len(inspect.getargspec(func).args)
+        f_args = len(inspect.getfullargspec(func).args)
 
-            # Check if the function is a method. If it is add 1 to args since self has to be the first arg.
-            if inspect.ismethod(func):
-                event_args += 1
+        # Check if the function is a method. If it is add 1 to args since self has to be the first arg.
+        if inspect.ismethod(func):
+            event_args += 1
 
-            if f_args != event_args:
-                warnings.warn(
-                    f"Event \"{event.name}\" does not have correct number of parameters. {event.args} needed; {f_args} given.")
-                return
-            self._callbacks[func.__name__] = func
-        else:
-            warnings.warn(f"Event \"{func.__name__}\" does not exist.")
+        if f_args != event_args:
+            logger.warning("Event \"%s\" does not have correct number of parameters. %d needed; %d given.",
+                           event.name, event.args, f_args)
+            return func
+
+        if budget is not None:
+            self._handler_budgets[func] = budget
+
+        if channel is None and user is None and command is None and predicate is None:
+            self._callbacks[event_name] = func
+            return func
+
+        if predicate is not None and not callable(predicate):
+            logger.warning("Event \"%s\" was given a predicate which is not callable.", event.name)
+            return func
+
+        channels = channel if isinstance(channel, list) else [channel]
+        users = user if isinstance(user, list) else [user]
+        for c in channels:
+            for u in users:
+                self._add_listener(Listener(event_name, func, c.lower().lstrip("#") if c else None,
+                                            u.lower() if u else None, command, predicate))
+
+        return func
 
     ###################################
     #            MESSAGES             #
     ###################################
 
+    def set_send_budget(self, limit=20, per=30, reserve=0.25):
+        """
+        This method is for keeping timed messages within the rate Twitch allows messages to be sent at (20 per 30 seconds, or 100 for moderators).
+        \nEvery message sent counts, but only timed messages wait: they are put off once less than {reserve} (a fraction of {limit}) of the budget is left, keeping it for command responses.
+        \nMessages sent over the budget are counted in the "dropped" attribute of the returned class:Quota:.
+        \nUse :None: as {limit} to stop tracking.
+        """
+
+        if limit is None:
+            self.send_budget = None
+            return None
+        if not isinstance(limit, int) or limit <= 0:
+            warnings.warn("Send budget limit has to be a positive integer.")
+            return None
+        if not isinstance(per, (int, float)) or per <= 0:
+            warnings.warn("Send budget window has to be a positive number of seconds.")
+            return None
+        if not isinstance(reserve, (int, float)) or not 0 <= reserve < 1:
+            warnings.warn("Send budget reserve must be a number from 0 up to (not including) 1.")
+            return None
+
+        self._send_reserve = reserve * limit
+        self.send_budget = Quota(limit, per, "global")
+        return self.send_budget
+
+    def _send_budget_wait(self):
+        # Seconds until a timed message can be sent without eating into the reserve, 0 if it can be sent now.
+        budget = self.send_budget
+        if budget is None:
+            return 0
+        with self._send_lock:
+            missing = self._send_reserve + 1 - budget.available(None, time.monotonic())
+        return missing / budget.rate if missing > 0 else 0
+
     def send_message(self, channel, message):
         """
         This method is for sending a message to a channel.
         """
 
+        if self.send_budget is not None:
+            with self._send_lock:
+                self.send_budget.consume(None, time.monotonic())
+
         message_final = f"PRIVMSG #{channel} :{message}\r\n"
         self._socket.send(message_final.encode("utf-8"))
 
@@ -791,12 +1373,15 @@ class Bot():
         # USERSTATE.
         if f":tmi.twitch.tv USERSTATE #" in line:
             userstate = self._read_userstate(line)
+            self.roles.update(self._user_id, self.nick, userstate.channel,
+                              userstate.badges, userstate.mod)
             self._call_event("on_userstate", userstate)
             return
 
         # GLOBALUSERSTATE.
         if f":tmi.twitch.tv GLOBALUSERSTATE" in line:
             globaluserstate = self._read_globaluserstate(line)
+            self._user_id = globaluserstate.user_id
             self._call_event("on_globaluserstate", globaluserstate)
             return
 
@@ -824,12 +1409,15 @@ class Bot():
         # jtv MODE.
         if "jtv MODE #" in line:
             mode = self._read_mode(line)
+            self.roles.invalidate(mode.user, mode.channel)
             self._call_event("on_mode", mode)
             return
 
         # CLEARCHAT.
         if ":tmi.twitch.tv CLEARCHAT #" in line:
             clearchat = self._read_clearchat(line)
+            if clearchat.user:
+                self.roles.invalidate(clearchat.user, clearchat.channel)
             self._call_event("on_clearchat", clearchat)
             if clearchat.user:
                 self._call_event("on_ban", clearchat.to_ban())
@@ -857,9 +1445,13 @@ class Bot():
         # PRIVMSG.
         if ".tmi.twitch.tv PRIVMSG #" in line:
             message, info = self._read_message(line)
+            self.roles.update(message.user_id, message.user, message.channel,
+                              message.badges, message.mod)
             if message.bits:
                 self._call_event("on_cheer", message)
             self._call_event("on_message", message)
+            if self._batching_enabled:
+                self._batch_message(message)
 
             # Handle timed_messages.
             self._handle_timed_messages(message)
@@ -867,8 +1459,22 @@ class Bot():
             # Handle commands.
             self._handle_commands(info)
         else:
-            warnings.warn(
-                f"When recieving data from Twitch, this got read wrong or got sent incorrectly by Twitch: \"{line}\"")
+            self.diagnostics.report_unparsed(line)
+
+    def _batch_message(self, message):
+        with self._batch_condition:
+            batch = self._batches.get(message.channel)
+            if batch is None:
+                batch = MessageBatch(message.channel, [], time.monotonic())
+                self._batches[message.channel] = batch
+                # Wake the batching thread so it sleeps until this batch is due.
+                self._batch_condition.notify()
+            batch.messages.append(message)
+            if len(batch.messages) < self._batch_size:
+                return
+            del self._batches[message.channel]
+
+        self._call_event("on_message_batch", batch)
 
     def _read_default(self, message):
         splitspace = message.split(" ", 1)
@@ -995,15 +1601,19 @@ class Bot():
         \nhttps://github.com/IsaacAKAJupiter/twitchircpy/wiki
         """
 
+        # Adding a lazy cog directly replaces its placeholders.
+        if cog in self._lazy_cogs:
+            self._remove_lazy_cog(cog)
+
         try:
             cog_o = importlib.import_module(cog)
-        except ModuleNotFoundError:
+        except Exception as e:
             if self._socket:
                 self._call_event("on_error", CogError(
-                    cog, f"An error occurred when trying to import the cog."))
+                    cog, f"An error occurred when trying to import the cog. Error: {e}"))
             else:
-                warnings.warn(
-                    f"An error occurred when importing cog: {cog}. This is a warning and not a class:Bot: error since it raised before \"run()\" was called.")
+                logger.warning(
+                    "An error occurred when importing cog: %s. This is logged and not a class:Bot: error since it raised before \"run()\" was called. Error: %s", cog, e)
             return
 
         self.cogs.append(cog_o)
@@ -1011,54 +1621,200 @@ class Bot():
             self._call_event("on_error", CogError(
                 cog, f"Attempt to add cog failed. Missing valid setup function."))
             self.remove_cog(cog)
-        else:
+            return
+
+        try:
             getattr(cog_o, "setup")(self)
+        except Exception as e:
+            # Same as "add_cogs", a cog which fails to set up is not added, including the commands it added so far.
+            self._call_event("on_error", CogError(
+                cog, f"An error occurred when trying to set up the cog. Error: {e}"))
+            self.remove_cog(cog)
+
+    def add_lazy_cog(self, cog, commands):
+        """
+        This method is for adding a cog without importing it until one of its commands gets used.
+        \nThe {commands} are the names (including aliases) of every command in the cog. They are reserved right away, so they show up in "check_command".
+        \nThe cog is then added like with "add_cog" upon the first use of one of the names.
+        """
+
+        if isinstance(commands, str) or not commands or not all(isinstance(c, str) for c in commands):
+            logger.warning("Lazy cog: %s was not added since the commands must be a non-empty list of strings.", cog)
+            return
 
-    def add_cogs(self, cogs):
+        if cog in self._lazy_cogs or self.get_cog(cog):
+            logger.warning("Lazy cog: %s was not added since it has already been added.", cog)
+            return
+
+        placeholders = []
+        for name in commands:
+            if name in self._command_index:
+                logger.warning(
+                    "Command: %s of lazy cog: %s was not added since there is another command that has the name.", name, cog)
+                continue
+            placeholder = Command(None, name, None, None, None, lazy=cog)
+            self._command_index[name] = placeholder
+            placeholders.append(placeholder)
+
+        self._lazy_cogs[cog] = placeholders
+
+    def _remove_lazy_cog(self, cog):
+        for placeholder in self._lazy_cogs.pop(cog, ()):
+            self._unindex_command(self._command_index, placeholder)
+
+    def _load_lazy_cog(self, cog, command):
+        # Returns the real command for the name once the cog is added, :None: if it failed to.
+        with self._cog_lock:
+            if cog in self._lazy_cogs:
+                self.add_cog(cog)
+            command_o = self._command_index.get(command)
+        return command_o if command_o is not None and command_o.lazy is None else None
+
+    def add_cogs(self, cogs, parallel=False, workers=None, dependencies=None):
         """
         This method is for adding multiple cogs via a list.
+        \nWith {parallel}, the cogs are imported and set up at the same time in a thread pool of {workers} threads, for cogs with slow setup functions.
+        Each cog shows up in "get_cog" as soon as it is set up, but the commands are only added once every cog is done, in the order of the list.
+        \nThe {dependencies} is a dict of cog name -> list of cog names which have to be loaded before it. A cog is only set up once its dependencies are,
+        so "get_cog" finds them within its setup function. Cogs whose dependencies failed are not added.
         """
 
+        if not parallel:
+            for cog in cogs:
+                self.add_cog(cog)
+            return
+
+        cogs = list(dict.fromkeys(cogs))
+        dependencies = dependencies or {}
+        remaining = {cog: list(dependencies.get(cog, ())) for cog in cogs}
+        # Cog name -> (module, cog classes) once set up, :None: if it failed.
+        done = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="twitchircpy-cog") as pool:
+            while remaining or running:
+                changed = True
+                while changed:
+                    changed = False
+                    for cog, needs in list(remaining.items()):
+                        error = None
+                        for need in needs:
+                            if need in done and done[need] is None:
+                                error = f"Attempt to add cog failed. Dependency: {need} failed to load."
+                            elif need not in remaining and need not in running.values() and need not in done and not self.get_cog(need):
+                                error = f"Attempt to add cog failed. Dependency: {need} is not loaded."
+                            if error:
+                                break
+                        if error:
+                            del remaining[cog]
+                            done[cog] = None
+                            self._call_event("on_error", CogError(cog, error))
+                            changed = True
+                        elif all(need in done or (need not in remaining and need not in running.values()) for need in needs):
+                            del remaining[cog]
+                            running[pool.submit(self._setup_cog_staged, cog)] = cog
+
+                if not running:
+                    # Whatever is left depends on each other.
+                    for cog in remaining:
+                        done[cog] = None
+                        self._call_event("on_error", CogError(
+                            cog, "Attempt to add cog failed. Circular dependency between cogs."))
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    cog = running.pop(future)
+                    done[cog], error = future.result()
+                    if error:
+                        self._call_event("on_error", CogError(cog, error))
+                    else:
+                        # Added before any of its dependents gets submitted above, so "get_cog" finds it in their setup.
+                        self.cogs.append(done[cog][0])
+
+        # Commands are registered in the order of the list, no matter which cog finished first.
+        modules = [done[cog][0] for cog in cogs if done.get(cog) is not None]
+        self.cogs = [c for c in self.cogs if c not in modules] + modules
         for cog in cogs:
-            self.add_cog(cog)
+            if done.get(cog) is None:
+                continue
+            if cog in self._lazy_cogs:
+                self._remove_lazy_cog(cog)
+            for cclass in done[cog][1]:
+                self.add_commands(cclass)
+
+    def _setup_cog_staged(self, cog):
+        # Runs in the thread pool of "add_cogs". Returns ((module, cog classes) | None, error | None).
+        try:
+            module = importlib.import_module(cog)
+        except Exception as e:
+            return None, f"An error occurred when trying to import the cog. Error: {e}"
+
+        if not self._check_for_valid_cog(module):
+            return None, "Attempt to add cog failed. Missing valid setup function."
+
+        # "add_commands" only collects the cog classes here, they get added once every cog is done.
+        self._staging.classes = []
+        try:
+            getattr(module, "setup")(self)
+            return (module, self._staging.classes), None
+        except Exception as e:
+            return None, f"An error occurred when trying to set up the cog. Error: {e}"
+        finally:
+            self._staging.classes = None
 
     def remove_cog(self, cog):
         """
         This method is for removing a cog from the class:Bot:.
+        \nThe commands of the cog are swapped out at once, then the module is dropped. Uses of them which are already running finish normally.
         """
 
-        for c in self.cogs:
-            if c.__name__ == cog:
-                self.cogs.remove(c)
-                self._remove_commands(c.__name__)
-                del sys.modules[c.__name__]
-                del c
-                return
+        if cog in self._lazy_cogs:
+            self._remove_lazy_cog(cog)
+            return
+
+        with self._cog_lock:
+            for c in self.cogs:
+                if c.__name__ == cog:
+                    self.cogs.remove(c)
+                    self._remove_commands(c.__name__)
+                    # Only once nothing can dispatch to the cog anymore.
+                    sys.modules.pop(c.__name__, None)
+                    return
 
     def remove_cogs(self, cogs):
         """
         This method is for removing multiple cogs from the class:Bot: via a list.
         """
 
-        removed = []
-        for c in self.cogs:
-            if c.__name__ in cogs:
-                removed.append(c)
+        for cog in cogs:
+            if cog in self._lazy_cogs:
+                self._remove_lazy_cog(cog)
 
-        for remove in removed:
-            self.cogs.remove(remove)
-            self._remove_commands(remove.__name__)
-            del sys.modules[remove.__name__]
-            del remove
+        with self._cog_lock:
+            removed = []
+            for c in self.cogs:
+                if c.__name__ in cogs:
+                    removed.append(c)
+
+            for remove in removed:
+                self.cogs.remove(remove)
+                self._remove_commands(remove.__name__)
+                sys.modules.pop(remove.__name__, None)
 
     def reload_cog(self, cog):
         """
         This method is for reloading a cog within the class:Bot:.
         \nUsed for dynamic chat commands without restarting the class:Bot:.
+        \nThe new commands are built while the old ones keep running, then swapped in at once. If the cog fails to load, the old commands are kept.
         """
 
-        self.remove_cog(cog)
-        self.add_cog(cog)
+        cog_o = self.get_cog(cog)
+        if cog_o is None or not getattr(cog_o, "__file__", None):
+            self.remove_cog(cog)
+            self.add_cog(cog)
+            return
+
+        self._swap_cog(cog)
 
     def reload_cogs(self, cogs):
         """
@@ -1066,8 +1822,84 @@ class Bot():
         """
 
         for cog in cogs:
-            self.remove_cog(cog)
-            self.add_cog(cog)
+            self.reload_cog(cog)
+
+    def _swap_cog(self, cog):
+        with self._cog_lock:
+            old = self.get_cog(cog)
+            if old is None:
+                return False
+
+            # Loaded as a new module object, so the old one stays in sys.modules until the swap.
+            try:
+                # Package cogs keep the search path of the loaded package, so relative imports in their __init__ still resolve.
+                if hasattr(old, "__path__"):
+                    spec = importlib.util.spec_from_file_location(
+                        cog, old.__file__, submodule_search_locations=list(old.__path__))
+                else:
+                    spec = importlib.util.spec_from_file_location(cog, old.__file__)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except Exception as e:
+                self._call_event("on_error", CogError(
+                    cog, f"An error occurred when trying to reload the cog. Error: {e}"))
+                return False
+
+            if not self._check_for_valid_cog(module):
+                self._call_event("on_error", CogError(
+                    cog, f"Attempt to reload cog failed. Missing valid setup function."))
+                return False
+
+            staging = {
+                "cog": cog,
+                "commands": [c for c in self.commands if c.cog.__module__ != cog],
+                "index": {name: c for name, c in self._command_index.items()
+                          if c.cog is None or c.cog.__module__ != cog},
+                "staged": set(),
+                "deferred": []
+            }
+            self._staging.cog = staging
+            try:
+                getattr(module, "setup")(self)
+            except Exception as e:
+                self._call_event("on_error", CogError(
+                    cog, f"An error occurred when trying to set up the reloaded cog. Error: {e}"))
+                return False
+            finally:
+                self._staging.cog = None
+
+            # Subcommands other cogs added to groups of this cog move to the new groups.
+            for command in staging["staged"]:
+                old_command = self._command_index.get(command.name)
+                if old_command is not None and old_command.cog is not None and old_command.cog.__module__ == cog:
+                    self._carry_subcommands(old_command, command, cog)
+
+            # Dispatch reads the index once per command, so it sees either the old or the new commands.
+            self.commands = staging["commands"]
+            self._command_index = staging["index"]
+            for command in self.commands:
+                if command not in staging["staged"]:
+                    self._remove_subcommands(command, cog)
+            for command in staging["deferred"]:
+                self._add_subcommand(command)
+
+            sys.modules[cog] = module
+            self.cogs[self.cogs.index(old)] = module
+            return True
+
+    def _carry_subcommands(self, old, new, cog_name):
+        for subcommand in list({id(c): c for c in old.subcommands.values()}.values()):
+            if subcommand.cog.__module__ != cog_name:
+                if not any(name in new.subcommands for name in self._command_names(subcommand)):
+                    subcommand.parent = new
+                    self._index_command(new.subcommands, subcommand)
+                    # Recompiled so they run the checks of the new group.
+                    for c in self._walk_commands([subcommand]):
+                        self._compile_command(c)
+                continue
+            replacement = new.subcommands.get(subcommand.name)
+            if replacement is not None:
+                self._carry_subcommands(subcommand, replacement, cog_name)
 
     def _check_for_valid_cog(self, cog):
         members = inspect.getmembers(cog)
@@ -1078,19 +1910,27 @@ class Bot():
 
         return False
 
-    def _check_taken_command(self, command):
-        if self.commands:
-            for c in self.commands:
-                if c.name == command.name or c.aliases and command.name in c.aliases:
-                    return True
+    def _command_names(self, command):
+        return [command.name] + command.aliases if command.aliases else [command.name]
 
-                if command.aliases:
-                    for alias in command.aliases:
-                        if alias == c.name or c.aliases and alias in c.aliases:
-                            return True
+    def _check_taken_command(self, command, index=None):
+        if index is None:
+            index = self._command_index
+        for name in self._command_names(command):
+            if name in index:
+                return True
 
         return False
 
+    def _index_command(self, index, command):
+        for name in self._command_names(command):
+            index[name] = command
+
+    def _unindex_command(self, index, command):
+        for name in self._command_names(command):
+            if index.get(name) is command:
+                del index[name]
+
     def add_commands(self, cclass):
         """
         This method is used within the "setup" function within a cog.
@@ -1100,43 +1940,116 @@ class Bot():
         \n    bot.add_commands(General(bot))
         """
 
-        classmembers = inspect.getmembers(cclass.__class__, inspect.isfunction)
-        for i in classmembers:
-            # Check for command.
-            if not "_decorators" in dir(i[1]):
+        # Cogs set up by "add_cogs" in parallel get their commands added afterwards, in order.
+        classes = getattr(self._staging, "classes", None)
+        if classes is not None:
+            classes.append(cclass)
+            return
+
+        # While a cog is being reloaded, its commands go to the staging area instead of the live index.
+        staging = getattr(self._staging, "cog", None)
+        commands = staging["commands"] if staging else self.commands
+        index = staging["index"] if staging else self._command_index
+
+        subcommands = []
+        for name, function, meta in _get_class_commands(cclass.__class__):
+            # Make the command object.
+            command_obj = Command(next(self._command_ids), meta.name or name, cclass, function, meta.cooldown,
+                                  meta.aliases, budget=meta.budget, cooldown_scope=meta.cooldown_scope,
+                                  max_concurrency=meta.max_concurrency, dedupe=meta.dedupe)
+
+            # Subcommands are attached once every group of the cog has been added.
+            if meta.kind == "subcommand":
+                subcommands.append(command_obj)
                 continue
 
-            if i[1]._decorators != "command":
+            # Check if name or aliases already taken. The rest of the cog still gets added.
+            if self._check_taken_command(command_obj, index):
+                logger.warning(
+                    "Command: %s was not added since there is another command that has the name or alias[es].", command_obj.name)
                 continue
 
-            # Make the command object.
-            command_obj = Command(len(self.commands),
-                                  i[0], cclass, i[1], None, None)
+            # Add the command.
+            self._compile_command(command_obj)
+            commands.append(command_obj)
+            self._index_command(index, command_obj)
+            if staging:
+                staging["staged"].add(command_obj)
+
+        # Parents first, so nested groups exist before their subcommands get attached.
+        subcommands.sort(key=lambda c: len(c.function._meta.parent))
+        for command_obj in subcommands:
+            self._add_subcommand(command_obj, index, staging)
+
+    def _add_subcommand(self, command, index=None, staging=None):
+        path = command.function._meta.parent
+        parent = (index if index is not None else self._command_index).get(path[0])
+        # Groups of other cogs are live, so subcommands for them wait until the reloaded cog is swapped in.
+        if staging and parent is not None and parent not in staging["staged"]:
+            staging["deferred"].append(command)
+            return
 
-            # Check if it has cooldown/aliases.
-            if "_cooldown" in dir(i[1]):
-                command_obj.cooldown = i[1]._cooldown
+        for name in path[1:]:
+            if parent is None:
+                break
+            parent = parent.subcommands.get(name)
 
-            if "_aliases" in dir(i[1]):
-                command_obj.aliases = i[1]._aliases
+        if parent is None or parent.lazy or not parent.function._meta.group:
+            logger.warning(
+                "Subcommand: %s was not added since there is no group: %s.", command.name, " ".join(path))
+            return
 
-            # Check if name or aliases already taken.
-            if self._check_taken_command(command_obj):
-                warnings.warn(
-                    f"Command: {command_obj.name} was not added since there is another command that has the name or alias[es].")
-                return
+        # Names only have to be unique within the group.
+        if any(name in parent.subcommands for name in self._command_names(command)):
+            logger.warning("Subcommand: %s was not added since group: %s has another subcommand that has the name or alias[es].",
+                           command.name, parent.qualified_name)
+            return
 
-            # Add the command.
-            self.commands.append(command_obj)
+        command.parent = parent
+        self._compile_command(command)
+        self._index_command(parent.subcommands, command)
+
+    def _resolve_subcommand(self, command, argline):
+        # Descends the groups one argument at a time, stopping at the first argument which is not a subcommand.
+        while command.subcommands and argline is not None:
+            name, separator, rest = argline.partition(" ")
+            subcommand = command.subcommands.get(name)
+            if subcommand is None:
+                break
+            command = subcommand
+            argline = rest if separator else None
+
+        return command, argline
+
+    def _walk_commands(self, commands):
+        for command in commands:
+            yield command
+            if command.subcommands:
+                # Aliases point to the same subcommand, so only walk each one once.
+                yield from self._walk_commands(
+                    list({id(c): c for c in command.subcommands.values()}.values()))
+
+    def _remove_subcommands(self, command, cog_name):
+        for subcommand in list({id(c): c for c in command.subcommands.values()}.values()):
+            if subcommand.cog.__module__ == cog_name:
+                self._unindex_command(command.subcommands, subcommand)
+            else:
+                self._remove_subcommands(subcommand, cog_name)
 
     def _remove_commands(self, cog_name):
-        removed = []
+        # Built on copies and swapped in at once like "_swap_cog", so dispatch sees either every command of the cog or none.
+        kept = []
+        index = dict(self._command_index)
         for command in self.commands:
             if command.cog.__module__ == cog_name:
-                removed.append(command)
+                self._unindex_command(index, command)
+            else:
+                # Other cogs can add subcommands to groups of this cog, and the other way around.
+                self._remove_subcommands(command, cog_name)
+                kept.append(command)
 
-        for remove in removed:
-            self.commands.remove(remove)
+        self.commands = kept
+        self._command_index = index
 
     ###################################
     #            COMMANDS             #
@@ -1148,57 +2061,161 @@ class Bot():
         # No builtins yet.
         pass
 
-    def _check_builtin_command(self, command):
-        for c in self._builtin_commands:
-            if c.name == command or c.aliases and command in c.aliases:
-                return True
+    def _add_builtin_command(self, command):
+        command.id = next(self._command_ids)
+        self._compile_command(command)
+        self._builtin_commands.append(command)
+        self._index_command(self._builtin_index, command)
 
-        return False
+    def _check_builtin_command(self, command):
+        return command in self._builtin_index
 
     def _get_builtin_command(self, command):
-        for c in self._builtin_commands:
-            if c.name == command or c.aliases and command in c.aliases:
-                return c
-
-        return None
+        return self._builtin_index.get(command)
 
     # Normal command functions.
 
+    def set_channel_prefix(self, channel, prefix):
+        """
+        This method is for giving a channel its own prefix(es), overriding the default prefix.
+        """
+
+        if not self._check_prefix(prefix):
+            self._call_event("on_error", CommonError(
+                "Channel prefix must be a string or a list of strings."))
+            return
+
+        self._channel_prefixes[channel.lower()] = prefix
+        self.invalidate_prefix(channel)
+
+    def remove_channel_prefix(self, channel):
+        """
+        This method is for removing the prefix(es) of a channel, going back to the default prefix.
+        """
+
+        self._channel_prefixes.pop(channel.lower(), None)
+        self.invalidate_prefix(channel)
+
+    def invalidate_prefix(self, channel=None):
+        """
+        This method is for clearing the cached prefixes of a channel (or every channel if :None:).
+        \nUse this when the "dynamic_prefix" event would return something different, since it only fires once per channel.
+        """
+
+        if channel is None:
+            self._prefix_cache = {}
+        else:
+            self._prefix_cache.pop(channel.lower(), None)
+
+    def _get_prefix_matcher(self, info):
+        matcher = self._prefix_cache.get(info.channel)
+        if matcher:
+            return matcher
+
+        prefix = self._channel_prefixes.get(info.channel)
+        if prefix is None:
+            prefix = self._call_event("dynamic_prefix", info)
+            if not prefix:
+                prefix = self._prefix
+            elif not self._check_prefix(prefix):
+                self._call_event("on_error", EventError(
+                    "dynamic_prefix", "This callback must return a string (or list of strings) as the prefix."))
+                prefix = self._prefix
+
+        matcher = PrefixMatcher(prefix if isinstance(prefix, list) else [prefix],
+                                self.nick if self.mention_prefix else None)
+        self._prefix_cache[info.channel] = matcher
+        return matcher
+
     def _handle_commands(self, info):
-        prefix = self._call_event("dynamic_prefix", info)
-        prefix = self._prefix if not prefix else prefix
-        if not isinstance(prefix, str):
-            self._call_event("on_error", EventError(
-                "dynamic_prefix", "This callback must return a string as the prefix."))
-            prefix = self._prefix
+        start = self._get_prefix_matcher(info).match(info.content)
+        if start is None:
+            return
+
+        command, separator, argline = info.content[start:].partition(" ")
+        # Quotas run before parsing the arguments so spam is dropped as cheaply as possible.
+        if self.quotas and not self._check_quotas(command, info):
+            return
+
+        # The arguments get parsed by the command's compiled callback.
+        self._run_command(command, info, argline if separator else None)
+
+    def add_quota(self, limit, per, scope="user", commands=None):
+        """
+        This method is for limiting how often commands can be used.
+        \nAllows {limit} commands every {per} seconds for each user ("user"), each channel ("channel") or the whole bot ("global").
+        \nIf a list of command names is given, the quota only applies to (and is shared by) those commands.
+        \nCommands going over the quota are dropped without firing "on_error". The amount dropped is in the "dropped" attribute of the returned class:Quota:.
+        """
+
+        if not isinstance(limit, int) or limit <= 0:
+            warnings.warn("Quota limit has to be a positive integer.")
+            return None
+        if not isinstance(per, (int, float)) or per <= 0:
+            warnings.warn("Quota window has to be a positive number of seconds.")
+            return None
+        if scope not in ("user", "channel", "global"):
+            warnings.warn("Quota scope must be \"user\", \"channel\" or \"global\".")
+            return None
+
+        quota = Quota(limit, per, scope, commands)
+        self.quotas.append(quota)
+        return quota
+
+    def remove_quota(self, quota):
+        """
+        This method is for removing a quota added with "add_quota".
+        """
+
+        if quota in self.quotas:
+            self.quotas.remove(quota)
+
+    def _check_quotas(self, command, info):
+        command_o = self._builtin_index.get(command) or self._command_index.get(command)
+        # Only actual commands use up a quota.
+        if not command_o:
+            return True
 
-        if info.content.startswith(prefix):
-            args = info.content.split(" ")
-            command = args[0][1:]
-            del args[0]
-            self._run_command(command, info, args)
+        now = time.monotonic()
+        quotas = [(quota, quota.key(info)) for quota in self.quotas
+                  if quota.commands is None or command_o.name in quota.commands]
+        # Every quota is checked before any token is taken, so a rejection does not use up the other quotas.
+        for quota, key in quotas:
+            if quota.available(key, now) < 1:
+                # Records the drop.
+                quota.consume(key, now)
+                self.stats.command(command_o.qualified_name).quota_rejections += 1
+                return False
+
+        for quota, key in quotas:
+            quota.consume(key, now)
+        return True
 
     def get_command(self, command):
         """
         This method is used for getting a command via name.
+        \nSubcommands can be got with their full name, like "queue add".
         """
 
-        for c in self.commands:
-            if c.name == command or c.aliases and command in c.aliases:
-                return c
+        if " " not in command:
+            return self._command_index.get(command)
 
-        return None
+        names = command.split()
+        command_obj = self._command_index.get(names[0])
+        for name in names[1:]:
+            if command_obj is None:
+                return None
+            command_obj = command_obj.subcommands.get(name)
+        return command_obj
 
     def check_command(self, command):
         """
         This method is used for checking if a command exists with the given name.
         """
 
-        for c in self.commands:
-            if c.name == command or c.aliases and command in c.aliases:
-                return True
-
-        return False
+        if " " not in command:
+            return command in self._command_index
+        return self.get_command(command) is not None
 
     def silence_command(self, command):
         """
@@ -1222,31 +2239,272 @@ class Bot():
             # Remove from silenced_commands.
             self.silenced_commands.remove(command_obj.id)
 
-    def _check_command_silenced(self, c_id):
-        for command in self.silenced_commands:
-            if command == c_id:
+    def add_middleware(self, function):
+        """
+        This method is for adding a check which runs before every command.
+        \nThe function is given the info and the command object, and must return True or False.
+        \nIf the function returns False, the command will not run.
+        """
+
+        if not callable(function):
+            self._call_event("on_error", DecoratorError(
+                function, "Middleware has to be a function."))
+            return
+
+        self._middleware.append(function)
+        self._compile_commands()
+
+    def remove_middleware(self, function):
+        """
+        This method is for removing a check added with "add_middleware".
+        """
+
+        if function in self._middleware:
+            self._middleware.remove(function)
+            self._compile_commands()
+
+    def _compile_commands(self):
+        for command in self._builtin_commands:
+            self._compile_command(command)
+        for command in self._walk_commands(self.commands):
+            self._compile_command(command)
+
+    def _compile_command(self, command):
+        # Builtin commands store the name of a method of class:Bot:, the cog being the bot itself.
+        if isinstance(command.function, str):
+            function = getattr(type(self), command.function)
+        else:
+            function = command.function
+        cog = command.cog
+
+        checks = []
+        for middleware in self._middleware:
+            checks.append(Check(getattr(middleware, "__name__", "middleware"), self._wrap_middleware(middleware, command),
+                                "Command check failed. User {user} failed the middleware: {check}. Command used: {command}"))
+        # Subcommands run the checks of every group on their path first, outermost group first.
+        checks.extend(self._parent_checks(command))
+        meta = getattr(function, "_meta", None)
+        if meta is not None:
+            checks.extend(meta.checks)
+        checks = tuple(checks)
+        parse = self._compile_arguments(function)
+        cache = meta.cache if meta is not None else None
+        cache_key = meta.cache_key if meta is not None else None
+
+        # The callback returns True if the function ran, False if the arguments or a check rejected it, None if a check raised.
+        def _callback(info, argline):
+            args, error = parse(argline)
+            if error is not None:
+                self._call_event("on_error", CommandError(
+                    command, info.user, info.channel, f"Error parsing arguments -> {error}"))
+                return False
+            roles = None
+            for c in checks:
+                if c.roles is not None:
+                    # Resolved once for every role check of the command.
+                    if roles is None:
+                        roles = self.roles.resolve(info)
+                    if roles.isdisjoint(c.roles):
+                        self._call_event("on_error", DecoratorError(
+                            function, c.failure(info, function, False)))
+                        return False
+                    continue
+                try:
+                    value = c.function(cog, info, *args)
+                except Exception as e:
+                    self._call_event("on_error", DecoratorError(
+                        function, c.exception(e)))
+                    return None
+                if value is not True:
+                    # Errors are only built once a check fails, never on the success path.
+                    self._call_event("on_error", DecoratorError(
+                        function, c.failure(info, function, value)))
+                    return False
+            if cache is None:
+                function(cog, info, *args)
                 return True
 
-        return False
+            key = cache_key(info, *args) if cache_key else (info.channel, tuple(args))
+            response = cache.get_or_compute(
+                key, lambda: function(cog, info, *args))
+            if isinstance(response, str):
+                self.send_message(info.channel, response)
+            return True
+
+        command.callback = _callback
+
+    def _parent_checks(self, command):
+        checks = []
+        parent = command.parent
+        while parent is not None:
+            meta = getattr(parent.function, "_meta", None)
+            if meta is not None and meta.checks:
+                # Group checks are called with the group's cog and the info, the arguments belong to the subcommand.
+                checks[:0] = [Check(c.name, self._wrap_parent_check(c.function, parent.cog) if c.function else None,
+                                    c.error, c.roles) for c in meta.checks]
+            parent = parent.parent
+        return checks
+
+    def _wrap_parent_check(self, function, cog):
+        def _check_parent(_, info, *args):
+            return function(cog, info)
+        return _check_parent
+
+    def _compile_arguments(self, function):
+        # Inspect the signature once, skipping self and info.
+        parameters = list(inspect.signature(function).parameters.values())[2:]
+        hints = self._get_type_hints(function)
+        specs = []
+        required = 0
+        greedy = False
+        simple = True
+        for parameter in parameters:
+            if parameter.kind in (inspect.Parameter.KEYWORD_ONLY, inspect.Parameter.VAR_KEYWORD):
+                continue
+            annotation = parameter.annotation
+            # String annotations (like with "from __future__ import annotations") are resolved to the actual types.
+            if isinstance(annotation, str):
+                annotation = hints.get(parameter.name, annotation)
+            converter = self._get_converter(annotation)
+            if converter:
+                simple = False
+            if parameter.kind == inspect.Parameter.VAR_POSITIONAL:
+                greedy = True
+                specs.append((parameter.name, converter, parameter.empty, "greedy"))
+                break
+            if annotation is Rest:
+                simple = False
+                specs.append((parameter.name, None, parameter.default, "rest"))
+                if parameter.default is parameter.empty:
+                    required += 1
+                break
+            specs.append((parameter.name, converter, parameter.default, "positional"))
+            if parameter.default is parameter.empty:
+                required += 1
+
+        total = len(specs) - 1 if greedy else len(specs)
+        empty = inspect.Parameter.empty
+
+        if simple:
+            # Plain string parameters only need the amount of arguments checked.
+            def _parse(argline):
+                args = argline.split(" ") if argline is not None else []
+                if len(args) < required:
+                    return None, f"Missing argument: {specs[len(args)][0]}."
+                if not greedy and len(args) > total:
+                    return None, f"Too many arguments given, expected at most {total}."
+                return args, None
+            return _parse
+
+        def _parse(argline):
+            tokens = argline.split(" ") if argline is not None else []
+            args = []
+            i = 0
+            for name, converter, default, kind in specs:
+                if kind == "greedy":
+                    values = tokens[i:]
+                    i = len(tokens)
+                else:
+                    if i >= len(tokens):
+                        if default is empty:
+                            return None, f"Missing argument: {name}."
+                        args.append(default)
+                        continue
+                    if kind == "rest":
+                        args.append(" ".join(tokens[i:]))
+                        i = len(tokens)
+                        continue
+                    values = tokens[i:i + 1]
+                    i += 1
+
+                if converter:
+                    try:
+                        values = [converter(value) for value in values]
+                    except (ValueError, TypeError):
+                        return None, f"Argument \"{name}\" could not be converted from: {' '.join(values)}."
+                args.extend(values)
+
+            if i < len(tokens):
+                return None, f"Too many arguments given, expected at most {total}."
+            return args, None
+        return _parse
+
+    def _get_type_hints(self, function):
+        try:
+            return typing.get_type_hints(function)
+        except Exception:
+            # Annotations which can not be resolved (like names only imported for type checking) stay strings.
+            return {}
+
+    def _get_converter(self, annotation):
+        # Optional[X] (added by "get_type_hints" for :None: defaults before Python 3.11) converts like X.
+        if getattr(annotation, "__origin__", None) is typing.Union:
+            args = [arg for arg in annotation.__args__ if arg is not type(None)]
+            if len(args) == 1:
+                annotation = args[0]
+        if annotation is inspect.Parameter.empty or annotation is str or isinstance(annotation, str):
+            return None
+        if annotation is bool:
+            return self._convert_bool
+        if hasattr(annotation, "convert"):
+            return annotation.convert
+        return annotation if callable(annotation) else None
+
+    def _convert_bool(self, argument):
+        argument = argument.lower()
+        if argument in ("yes", "y", "true", "t", "1", "on"):
+            return True
+        if argument in ("no", "n", "false", "f", "0", "off"):
+            return False
+        raise ValueError(f"{argument} is not a boolean.")
+
+    def _wrap_middleware(self, middleware, command):
+        def _check_middleware(cog, info, *args):
+            return middleware(info, command)
+        return _check_middleware
 
-    def _check_command_in_cooldown(self, c_id, channel):
-        for cooldown in self.cooldowns:
-            if isinstance(cooldown, Cooldown):
-                if cooldown.command_id == c_id and cooldown.channel == channel:
-                    return cooldown
+    def _check_command_silenced(self, c_id):
+        return c_id in self.silenced_commands
+
+    def _cooldown_key(self, command, channel, user):
+        if command.cooldown_scope == "user":
+            return command.id, channel, user
+        if command.cooldown_scope == "global":
+            return command.id, None, None
+        return command.id, channel, None
+
+    def _check_command_in_cooldown(self, command, channel, user=None):
+        key = self._cooldown_key(command, channel, user)
+        cooldown = self.cooldowns.get(key)
+        if cooldown is None:
+            return None
+        # Expire lazily instead of counting every cooldown down each second.
+        if cooldown.expired:
+            # The sweep in "_add_cooldown" can swap the dict meanwhile, so the entry may be gone already.
+            self.cooldowns.pop(key, None)
+            return None
+        return cooldown
 
+    def _check_path_in_cooldown(self, command, info):
+        while command is not None:
+            cooldown_o = self._check_command_in_cooldown(
+                command, info.channel, info.user)
+            if cooldown_o:
+                return cooldown_o
+            command = command.parent
         return None
 
-    def _run_command(self, command, info, args):
+    def _run_command(self, command, info, argline):
         # Builtin commands.
-        if self._check_builtin_command(command) == True:
-            command_o = self._get_builtin_command(command)
+        command_o = self._builtin_index.get(command)
+        if command_o:
             cooldown_o = self._check_command_in_cooldown(
-                command_o.id, info.channel)
+                command_o, info.channel, info.user)
             # Check for cooldown.
             if cooldown_o:
+                self.stats.command(command_o.qualified_name).cooldown_rejections += 1
                 self._call_event("on_error", CooldownError(
-                    command_o, info.user, info.channel, f"Command on cooldown, please wait {cooldown_o.time} seconds."))
+                    command_o, info.user, info.channel, f"Command on cooldown, please wait {cooldown_o.time:.1f} seconds."))
                 return
 
             # if command_o.last_used:
@@ -1258,27 +2516,28 @@ class Bot():
 
             # Check for silenced command.
             if self._check_command_silenced(command_o.id):
+                self.stats.command(command_o.qualified_name).silenced_rejections += 1
                 self._call_event("on_error", SilencedError(
                     command_o, info.user, info.channel, "Command has been silenced, so it cannot be run."))
                 return
 
-            # Run command.
-            getattr(self, command_o.function)(info, *args)
-            # Add cooldown.
-            if command_o.cooldown:
-                self._add_cooldown(command_o, info.channel)
-            # Call event for command fired.
-            self._call_event("command_fired", info, command_o)
+            # Run command. The cooldown starts now, "command_fired" follows once it ran, see "_call_command".
+            self._call_command(command_o, info, argline)
 
         # Actual commands from cogs.
-        if self.check_command(command):
-            command_o = self.get_command(command)
-            cooldown_o = self._check_command_in_cooldown(
-                command_o.id, info.channel)
+        command_o = self._command_index.get(command)
+        if command_o is not None and command_o.lazy:
+            command_o = self._load_lazy_cog(command_o.lazy, command)
+        if command_o:
+            if command_o.subcommands:
+                command_o, argline = self._resolve_subcommand(command_o, argline)
+            # The cooldowns of the groups on the path apply to their subcommands too.
+            cooldown_o = self._check_path_in_cooldown(command_o, info)
             # Check for cooldown.
             if cooldown_o:
+                self.stats.command(command_o.qualified_name).cooldown_rejections += 1
                 self._call_event("on_error", CooldownError(
-                    command_o, info.user, info.channel, f"Command on cooldown, please wait {cooldown_o.time} seconds."))
+                    command_o, info.user, info.channel, f"Command on cooldown, please wait {cooldown_o.time:.1f} seconds."))
                 return
 
             # if command_o.last_used:
@@ -1290,27 +2549,143 @@ class Bot():
 
             # Check for silenced command.
             if self._check_command_silenced(command_o.id):
+                self.stats.command(command_o.qualified_name).silenced_rejections += 1
                 self._call_event("on_error", SilencedError(
                     command_o, info.user, info.channel, "Command has been silenced, so it cannot be run."))
                 return
 
-            # Run command.
-            try:
-                command_o.function(
-                    command_o.cog, info, *args) if args else command_o.function(command_o.cog, info)
-            except TypeError as e:
-                self._call_event("on_error", CommandError(
-                    command_o, info.user, info.channel, f"Error running function -> TypeError: {e}"))
-                return
-            # Add cooldown if command has it.
+            # Run command. The cooldown starts now, "command_fired" follows once it ran, see "_call_command".
             #command_o.last_used = datetime.datetime.now()
-            if command_o.cooldown:
-                self._add_cooldown(command_o, info.channel)
+            self._call_command(command_o, info, argline)
+
+    def _call_command(self, command_o, info, argline):
+        if command_o.max_concurrency is None and not command_o.dedupe:
+            cooldown_o = self._start_cooldown(command_o, info)
+            if self._watchdog_enabled:
+                result = self._invoke(command_o.function, self._run_callback,
+                                      (command_o, info, argline, cooldown_o), command_o.budget)
+                # Quarantined commands never run, so their cooldown is taken back here.
+                if result is None:
+                    self._cancel_cooldown(command_o, info, cooldown_o)
+                return result
+            return self._run_callback(command_o, info, argline, cooldown_o)
+
+        key = self._acquire_command(command_o, info, argline)
+        if key is False:
+            return False
+        cooldown_o = self._start_cooldown(command_o, info)
+
+        def _release():
+            self._release_command(command_o, key)
+
+        if self._watchdog_enabled:
+            result = self._invoke(command_o.function, self._run_callback, (command_o, info, argline, cooldown_o),
+                                  command_o.budget, done=_release)
+            if result is None:
+                self._cancel_cooldown(command_o, info, cooldown_o)
+            return result
+        try:
+            return self._run_callback(command_o, info, argline, cooldown_o)
+        finally:
+            _release()
+
+    def _acquire_command(self, command_o, info, argline):
+        # Returns the dedupe key (or None) once a slot is taken, False if the command got rejected.
+        key = (command_o.id, info.channel, argline) if command_o.dedupe else None
+        error = None
+        with self._concurrency_lock:
+            running = self._running_commands.get(command_o.id, 0)
+            if key is not None and key in self._inflight_commands:
+                error = "Command is already running with the same arguments."
+            elif command_o.max_concurrency is not None and running >= command_o.max_concurrency:
+                error = f"Command is already running {running} times, please wait."
+            else:
+                self._running_commands[command_o.id] = running + 1
+                if key is not None:
+                    self._inflight_commands.add(key)
+                return key
+
+        self.stats.command(command_o.qualified_name).concurrency_rejections += 1
+        self._call_event("on_error", ConcurrencyError(
+            command_o, info.user, info.channel, error))
+        return False
+
+    def _release_command(self, command_o, key):
+        with self._concurrency_lock:
+            running = self._running_commands.get(command_o.id, 1) - 1
+            if running:
+                self._running_commands[command_o.id] = running
+            else:
+                self._running_commands.pop(command_o.id, None)
+            if key is not None:
+                self._inflight_commands.discard(key)
+
+    def _run_callback(self, command_o, info, argline, cooldown_o=None):
+        # Runs where the command runs (a watchdog worker or the reader thread), so the result is the callback's real one.
+        result = self._call_callback(command_o, info, argline)
+        if result:
             # Call event for command_fired.
             self._call_event("command_fired", info, command_o)
-
-    def _add_cooldown(self, command, channel):
-        self.cooldowns.append(Cooldown(command.id, channel, command.cooldown))
+        else:
+            self._cancel_cooldown(command_o, info, cooldown_o)
+        return result
+
+    def _start_cooldown(self, command_o, info):
+        # Started on the reader thread when the command is dispatched, so invocations waiting for a watchdog worker
+        # already see it. Taken back by "_cancel_cooldown" if the command is rejected or never runs.
+        # Subcommands also start the cooldowns of the groups on their path. Returns [(command, cooldown)] or :None:.
+        started = None
+        command = command_o
+        while command is not None:
+            if command.cooldown:
+                if started is None:
+                    started = []
+                started.append((command, self._add_cooldown(command, info.channel, info.user)))
+            command = command.parent
+        return started
+
+    def _cancel_cooldown(self, command_o, info, cooldown_o):
+        if cooldown_o is None:
+            return
+        for command, cooldown in cooldown_o:
+            key = self._cooldown_key(command, info.channel, info.user)
+            # Only if it is still the cooldown this invocation started.
+            if self.cooldowns.get(key) is cooldown:
+                self.cooldowns.pop(key, None)
+
+    def _call_callback(self, command_o, info, argline):
+        stats = self.stats.command(command_o.qualified_name)
+        stats.invocations += 1
+        start = time.perf_counter()
+        result = None
+        try:
+            result = command_o.callback(info, argline)
+        except TypeError as e:
+            self._call_event("on_error", CommandError(
+                command_o, info.user, info.channel, f"Error running function -> TypeError: {e}"))
+        finally:
+            stats.observe(time.perf_counter() - start)
+            # Errors are exceptions (in the function or a check), rejections are arguments or checks saying no.
+            if result is None:
+                stats.errors += 1
+            elif not result:
+                stats.rejected += 1
+        return result
+
+    def _add_cooldown(self, command, channel, user=None):
+        key = self._cooldown_key(command, channel, user)
+        cooldown = self.cooldowns[key] = Cooldown(command.id, key[1], command.cooldown, key[2])
+
+        # Sweep expired cooldowns once the dict doubles in size, keeping memory bounded without a thread.
+        if len(self.cooldowns) >= self._cooldown_sweep_at:
+            self._sweep_cooldowns()
+            self._cooldown_sweep_at = max(64, len(self.cooldowns) * 2)
+        return cooldown
+
+    def _sweep_cooldowns(self):
+        now = time.monotonic()
+        self.cooldowns = {key: cooldown for key, cooldown in self.cooldowns.items()
+                          if cooldown.deadline > now}
 
     # Actual chat commands.
     def ban(self, channel, user, reason=None):
@@ -0,0 +1,35 @@
+import time as ptime
+
+
+class ChatCounter():
+
+    """
+    Class used for counting the chats of a channel, shared by every timed message of the channel.
+    Should not be manually created in most cases. Instead use the method: "add_timed_message" of class:Bot:.
+
+    Parameters
+    ==========
+    chats -> Optional[:int:]
+        The amount of chats in the channel since the counter was created.
+        Timed messages keep where they last reset instead of counting themselves.
+    refs -> Optional[:int:]
+        The amount of timed messages using the counter.
+        The counter is dropped once it reaches 0.
+    rate -> Optional[:float:]
+        The moving average of chats per second, updated when adaptive timed messages are attempted.
+    sampled_chats -> Optional[:int:]
+        The amount of chats when the rate was last sampled.
+    sampled_at -> Optional[:float: | :None:]
+        Monotonic time of when the rate was last sampled.
+        Can be :None: for now.
+    """
+
+    def __init__(self, chats=0, refs=0, rate=0.0, sampled_chats=0, sampled_at=None):
+        self.chats = chats
+        self.refs = refs
+        self.rate = rate
+        self.sampled_chats = sampled_chats
+        self.sampled_at = sampled_at if sampled_at is not None else ptime.monotonic()
+
+    def __repr__(self):
+        return f"ChatCounter(chats: {self.chats}, refs: {self.refs}, rate: {self.rate:.2f})"
@@ -0,0 +1,40 @@
+class Check():
+
+    """
+    Class used for storing information about a command check.
+    All checks of a command are compiled into a single callable when the command is added to the class:Bot:.
+    Should not be manually created in most cases. Instead use the check decorators, like "ismoderator" or "check".
+
+    Parameters
+    ==========
+    name -> :str:
+        The name of the check.
+        Used for error messages.
+    function -> :function: | :None:
+        The function called with every argument of the command (including the cog and info).
+        Has to return True for the command to run.
+        Can be :None: if the check only uses roles.
+    error -> :str:
+        The error message for when the check fails.
+        Only formatted upon failure, with {user}, {command} and {check}.
+    roles -> Optional[:frozenset<str>: | :None:]
+        The roles (badge names) allowed to use the command, resolved through the role cache of class:Bot:.
+        Can be :None: if the check uses a function.
+    """
+
+    def __init__(self, name, function, error, roles=None):
+        self.name = name
+        self.function = function
+        self.error = error
+        self.roles = roles
+
+    def __repr__(self):
+        return f"Check(name: {self.name}, function: {self.function})"
+
+    def failure(self, info, command, value):
+        if value is not False:
+            return f"The return function for @bot.check() needs to return either True or False. Return function name: {self.name}."
+        return self.error.format(user=info.display_name, command=command.__name__, check=self.name)
+
+    def exception(self, e):
+        return f"@bot.check() tried to call the function: {self.name} but the function raised this exception: {e}."
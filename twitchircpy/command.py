@@ -16,22 +16,54 @@ class Command():
     function -> :function:
         The function object of the command.
         Used for calling the command.
-    cooldown -> :int: | :None:
+    cooldown -> :int: | :float: | :None:
         The cooldown amount for the command in seconds.
         Can be :None: if there is no cooldown.
     aliases -> Optional[:list<str>: | :None:]
         List of aliases for the command.
         Can be :None: if there are no aliases.
+    cooldown_scope -> Optional[:str:]
+        What the cooldown applies to: "channel" (default), "user" (per user in each channel) or "global".
+    budget -> Optional[:int: | :float: | :None:]
+        The amount of seconds the command is allowed to run for when the watchdog is running.
+        Can be :None: to use the watchdog's default budget.
+    max_concurrency -> Optional[:int: | :None:]
+        The amount of times the command can be running at once.
+        Can be :None: for no limit.
+    dedupe -> Optional[:bool:]
+        Whether uses with the same channel and arguments are rejected while one is already running.
+    parent -> Optional[:Command: | :None:]
+        The group the command is a subcommand of.
+        Can be :None: for top-level commands.
+    lazy -> Optional[:str: | :None:]
+        The name of the lazy cog the command is a placeholder for, imported upon the first use of the command.
+        Can be :None: for loaded commands.
     """
 
-    def __init__(self, command_id, name, cog, function, cooldown, aliases=None, last_used=None):
+    def __init__(self, command_id, name, cog, function, cooldown, aliases=None, last_used=None, budget=None, cooldown_scope="channel", max_concurrency=None, dedupe=False, parent=None, lazy=None):
         self.id = command_id
         self.name = name
         self.cog = cog
         self.function = function
         self.cooldown = cooldown
+        self.cooldown_scope = cooldown_scope
         self.aliases = aliases
         self.last_used = last_used
+        self.budget = budget
+        self.max_concurrency = max_concurrency
+        self.dedupe = dedupe
+        self.parent = parent
+        self.lazy = lazy
+        # Name/alias -> subcommand. Empty unless the command is a group.
+        self.subcommands = {}
+        # Compiled by class:Bot: when the command gets added. Runs the checks then the function.
+        self.callback = None
+
+    @property
+    def qualified_name(self):
+        if self.parent is None:
+            return self.name
+        return f"{self.parent.qualified_name} {self.name}"
 
     @property
     def description(self):
@@ -0,0 +1,31 @@
+class CommandMeta():
+
+    """
+    Class used for storing everything the command decorators set on a function.
+    Each function gets a single record, read with one attribute lookup when its cog gets added.
+    Should not be manually created in most cases. Instead use the command decorators, like "command" or "cooldown".
+
+    Parameters
+    ==========
+    kind -> :str: | :None:
+        "command" for commands and groups, "subcommand" for subcommands.
+        Can be :None: if the function only has other decorators (so far).
+    """
+
+    def __init__(self, kind=None):
+        self.kind = kind
+        self.group = False
+        self.parent = None
+        self.name = None
+        self.cooldown = None
+        self.cooldown_scope = "channel"
+        self.aliases = None
+        self.checks = []
+        self.budget = None
+        self.max_concurrency = None
+        self.dedupe = False
+        self.cache = None
+        self.cache_key = None
+
+    def __repr__(self):
+        return f"CommandMeta(kind: {self.kind}, name: {self.name}, parent: {self.parent}, cooldown: {self.cooldown}, aliases: {self.aliases})"
@@ -0,0 +1,23 @@
+class User(str):
+
+    """
+    Annotation for command parameters which take a user.
+    The argument gets the "@" removed and gets lowercased, so "@Jups" becomes "jups".
+    Example: def hug(self, info, user: User)
+    """
+
+    @classmethod
+    def convert(cls, argument):
+        return cls(argument.lstrip("@").lower())
+
+
+class Rest(str):
+
+    """
+    Annotation for the last parameter of a command to get the rest of the message as a single string.
+    Example: def say(self, info, channel, message: Rest)
+    """
+
+    @classmethod
+    def convert(cls, argument):
+        return cls(argument)
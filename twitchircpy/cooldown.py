@@ -1,3 +1,6 @@
+import time as ptime
+
+
 class Cooldown():
 
     """
@@ -8,18 +11,35 @@ class Cooldown():
     ==========
     command_id -> :int:
         This is the internal ID for the command on cooldown.
-    channel -> :str:
+    channel -> :str: | :None:
         The channel that the command entered cooldown in.
         Used to enable cooldowns per channel for commands.
-    time -> :int:
-        The current cooldown, in seconds, the command has left.
-        A dynamic variable that gets decreased every second.
+        Can be :None: for global cooldowns.
+    time -> :int: | :float:
+        The cooldown, in seconds, the command has left.
+        Stored as a monotonic deadline, so reading it gives the time left.
+    user -> Optional[:str: | :None:]
+        The user that the command entered cooldown for.
+        Can be :None: if the cooldown is not per user.
     """
 
-    def __init__(self, command_id, channel, time):
+    def __init__(self, command_id, channel, time, user=None):
         self.command_id = command_id
         self.channel = channel
-        self.time = time
+        self.user = user
+        self.deadline = ptime.monotonic() + time
+
+    @property
+    def time(self):
+        return max(self.deadline - ptime.monotonic(), 0)
+
+    @time.setter
+    def time(self, t):
+        self.deadline = ptime.monotonic() + t
+
+    @property
+    def expired(self):
+        return ptime.monotonic() >= self.deadline
 
     def __repr__(self):
-        return f"Cooldown(command_id: {self.command_id}, channel: {self.channel}, time: {self.time})"
+        return f"Cooldown(command_id: {self.command_id}, channel: {self.channel}, user: {self.user}, time: {self.time:.1f})"
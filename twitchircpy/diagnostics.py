@@ -0,0 +1,87 @@
+import logging
+import random
+import time as ptime
+
+from .quota import Quota
+
+logger = logging.getLogger("twitchircpy")
+
+
+class Diagnostics():
+
+    """
+    Class used for counting and reporting lines from Twitch which class:Bot: could not parse.
+    Lines are counted by their IRC command (like "PRIVMSG" or "421"), and only some are logged to the "twitchircpy" logger,
+    so a flood of unknown lines costs a dict update each instead of a warning each.
+    Should not be manually created in most cases. Instead use the "diagnostics" attribute of class:Bot:.
+
+    Parameters
+    ==========
+    limit -> Optional[:int:]
+        The amount of lines logged every {per} seconds.
+        Lines over the limit are only counted, and the amount skipped is added to the next logged line.
+    per -> Optional[:int: | :float:]
+        The window of {limit} in seconds.
+    sample -> Optional[:float:]
+        The chance (from 0 to 1) of a line being considered for logging at all.
+    """
+
+    # Commands past this amount are counted under "other", so garbage lines can not grow the counters.
+    MAX_VERBS = 64
+
+    def __init__(self, limit=10, per=60, sample=1.0):
+        self.limit = limit
+        self.per = per
+        self.sample = sample
+        self.unparsed = 0
+        # Total lines not logged, next to the amount skipped since the last logged line.
+        self.suppressed = 0
+        self._skipped = 0
+        self.verbs = {}
+        self._quota = Quota(limit, per, "global")
+
+    def __repr__(self):
+        return f"Diagnostics(unparsed: {self.unparsed}, suppressed: {self.suppressed}, verbs: {len(self.verbs)})"
+
+    @staticmethod
+    def verb(line):
+        """
+        Returns the IRC command of {line}, skipping the tags and prefix.
+        """
+
+        parts = line.split(" ", 3)
+        index = 0
+        if parts[0].startswith("@"):
+            index += 1
+        if index < len(parts) and parts[index].startswith(":"):
+            index += 1
+        return parts[index] if index < len(parts) else ""
+
+    def report_unparsed(self, line):
+        self.unparsed += 1
+        verb = self.verb(line)
+        if verb not in self.verbs and len(self.verbs) >= self.MAX_VERBS:
+            verb = "other"
+        self.verbs[verb] = self.verbs.get(verb, 0) + 1
+
+        if (self.sample < 1 and random.random() >= self.sample) or not self._quota.consume(None, ptime.monotonic()):
+            self.suppressed += 1
+            self._skipped += 1
+            return
+
+        logger.warning("Could not parse line from Twitch (%s, %d skipped since the last one): %.512s",
+                       verb or "empty", self._skipped, line)
+        self._skipped = 0
+
+    def to_dict(self):
+        return {
+            "unparsed": self.unparsed,
+            "suppressed": self.suppressed,
+            "verbs": dict(self.verbs)
+        }
+
+    def reset(self):
+        self.unparsed = 0
+        self.suppressed = 0
+        self._skipped = 0
+        self.verbs = {}
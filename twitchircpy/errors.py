@@ -38,6 +38,18 @@ class CooldownError(CommandError):
         return f"CooldownError(command: {self.command}, user: {self.user}, channel: {self.channel}, error: {self.error})"
 
 
+class ConcurrencyError(CommandError):
+
+    """
+    This class is the exact same as class:CommandError: except with a different name and only fired when the command error is for concurrency limits.
+    Occurs when a command is already running with the same arguments, or is running too many times at once.
+    Should not be manually created in most cases.
+    """
+
+    def __repr__(self):
+        return f"ConcurrencyError(command: {self.command}, user: {self.user}, channel: {self.channel}, error: {self.error})"
+
+
 class SilencedError():
 
     """
@@ -180,3 +192,38 @@ class CommonError():
 
     def __repr__(self):
         return f"CommonError(error: {self.error})"
+
+
+class WatchdogError():
+
+    """
+    This class is used for storing information about handlers going over their time budget.
+    Usually occurs upon a command or event taking too long, like waiting on a network call.
+    Should not be manually created in most cases.
+
+    Parameters
+    ==========
+    handler -> :function:
+        The command or event function that went over its budget.
+    elapsed -> :float:
+        The amount of seconds the handler had been running for when reported.
+    budget -> :float:
+        The amount of seconds the handler was allowed to run for.
+    violations -> :int:
+        The amount of times the handler went over its budget.
+    quarantined -> :bool:
+        Whether or not the handler got quarantined, stopping it from firing.
+    error -> :str:
+        This is the actual error message.
+    """
+
+    def __init__(self, handler, elapsed, budget, violations, quarantined, error):
+        self.handler = handler
+        self.elapsed = elapsed
+        self.budget = budget
+        self.violations = violations
+        self.quarantined = quarantined
+        self.error = error
+
+    def __repr__(self):
+        return f"WatchdogError(handler: {self.handler}, elapsed: {self.elapsed:.3f}, budget: {self.budget}, quarantined: {self.quarantined}, error: {self.error})"
@@ -25,4 +25,4 @@ class ChatCommandCooldown(twitchircpy.Cooldown):
         self.aliases = aliases
 
     def __repr__(self):
-        return f"ChatCommandCooldown(name: {self.name}, aliases: {self.aliases}, channel: {self.channel}, time: {self.time})"
+        return f"ChatCommandCooldown(name: {self.name}, aliases: {self.aliases}, channel: {self.channel}, time: {self.time:.1f})"
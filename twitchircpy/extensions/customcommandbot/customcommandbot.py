@@ -1,6 +1,5 @@
 import re
 import inspect
-import os
 import datetime
 import math
 
@@ -30,7 +29,7 @@ class Bot(twitchircpy.bot.Bot):
         Note, this is not an actual OAuth Token.
     nick -> :str:
         The nickname (nick) must be your Twitch username/handle.
-    prefix -> :str:
+    prefix -> :str: | :list<str>:
         The prefix is used for the bot's commands.
         These commands are added with cogs.
         Mandatory since there is no default prefix.
@@ -44,14 +43,20 @@ class Bot(twitchircpy.bot.Bot):
         Also for responding to Twitch's IRC Reconnect.
         This should be True on most occasions.
         Could be False if using for temporary bot.
+    mention_prefix -> Optional[:bool:]
+        Whether or not mentioning the bot ("@nick command") can be used as a prefix.
+        False by default.
     """
 
-    def __init__(self, oath, nick, prefix, channel, reconnect):
-        super().__init__(oath, nick, prefix, channel, reconnect)
+    def __init__(self, oath, nick, prefix, channel, reconnect, mention_prefix=False):
+        super().__init__(oath, nick, prefix, channel, reconnect, mention_prefix)
         self.chat_commands = []
         self.variables = []
         self._chat_command_permissions = ["user", "moderator", "subscriber", "admin",
                                           "bits", "broadcaster", "global_mod", "staff", "turbo", "vip", "premium"]
+        # Permission name -> role name in the role cache.
+        self._chat_command_roles = {permission: permission for permission in self._chat_command_permissions}
+        self._chat_command_roles["globalmod"] = "global_mod"
 
         self._append_builtins()
         self._append_variables()
@@ -298,21 +303,21 @@ class Bot(twitchircpy.bot.Bot):
         if self._check_chat_command(command, info.channel):
             command_o = self._get_chat_command(command, info.channel)
             cooldown_o = self._check_chat_command_cooldown(
-                command, info.channel)
+                command_o.name, info.channel)
             if not cooldown_o:
                 if self._check_chat_command_permission(info, command_o):
                     formatted_response = self._format_response(info, command_o)
                     if formatted_response:
                         self.send_message(info.channel, formatted_response)
                         self._call_event("chatcommand_fired", info, command_o)
-                        self.cooldowns.append(ChatCommandCooldown(
-                            command_o.name, command_o.aliases, info.channel, command_o.cooldown))
+                        self._add_chat_command_cooldown(
+                            command_o, info.channel)
                 else:
                     self._call_event("on_error", ChatCommandError(
                         command, info.user, info.channel, f"User does not have permission to use this command."))
             else:
                 self._call_event("on_error", ChatCommandError(
-                    command, info.user, info.channel, f"Command is on cooldown for another {cooldown_o.time} seconds."))
+                    command, info.user, info.channel, f"Command is on cooldown for another {cooldown_o.time:.1f} seconds."))
 
     def _check_chat_command(self, command, channel):
         for c in self.chat_commands:
@@ -329,59 +334,29 @@ class Bot(twitchircpy.bot.Bot):
         return None
 
     def _check_chat_command_cooldown(self, command, channel):
-        for cooldown in self.cooldowns:
-            if isinstance(cooldown, ChatCommandCooldown):
-                if (cooldown.name == command and cooldown.channel == channel) or (cooldown.aliases and command in cooldown.aliases and cooldown.channel == channel):
-                    return cooldown
-
-        return None
+        key = ("chatcommand", command, channel)
+        cooldown = self.cooldowns.get(key)
+        if cooldown is None:
+            return None
+        if cooldown.expired:
+            # The dict can be swapped by the sweep in "_add_cooldown" meanwhile, so the entry may be gone already.
+            self.cooldowns.pop(key, None)
+            return None
+        return cooldown
+
+    def _add_chat_command_cooldown(self, command, channel):
+        # Keyed by the command name, so aliases share the cooldown.
+        self.cooldowns[("chatcommand", command.name, channel)] = ChatCommandCooldown(
+            command.name, command.aliases, channel, command.cooldown)
 
     def _check_chat_command_permission(self, info, command):
         # If permission is user, return True.
         if command.permission == "user":
             return True
 
-        # Check for mod.
-        if command.permission == "moderator":
-            if "moderator/1" in info.badges or "broadcaster/1" in info.badges:
-                return True
-
-        # Check for sub.
-        if command.permission == "subscriber":
-            if "subscriber/1" in info.badges or "broadcaster/1" in info.badges:
-                return True
-
-        # Check for broadcaster.
-        if command.permission == "broadcaster":
-            if "broadcaster/1" in info.badges:
-                return True
-
-        # Check for bits.
-        if command.permission == "bits":
-            if "bits/" in info.badges or "broadcaster/1" in info.badges:
-                return True
-
-        # Check for admin.
-        if command.permission == "admin":
-            if "admin/1" in info.badges or "broadcaster/1" in info.badges:
-                return True
-
-        # Check for global mod.
-        if command.permission == "globalmod":
-            if "global_mod/1" in info.badges or "broadcaster/1" in info.badges:
-                return True
-
-        # Check for staff.
-        if command.permission == "staff":
-            if "staff/1" in info.badges or "broadcaster/1" in info.badges:
-                return True
-
-        # Check for turbo.
-        if command.permission == "turbo":
-            if "turbo/1" in info.badges or "broadcaster/1" in info.badges:
-                return True
-
-        return False
+        # Resolve through the same role cache as the command checks. The broadcaster can use everything.
+        roles = self.roles.resolve(info)
+        return "broadcaster" in roles or self._chat_command_roles.get(command.permission) in roles
 
     def _add_chat_command(self, channel, command, *response, edit=False, cooldown=None, permission=None, count=None, timeuntil=None, timesince=None):
         # Check if it exists.
@@ -530,12 +505,12 @@ class Bot(twitchircpy.bot.Bot):
     ###################################
 
     def _append_builtins(self):
-        self._builtin_commands.append(twitchircpy.Command(
-            len(self.commands), "addcommand", self, "_add_command", None, ["addcom"]))
-        self._builtin_commands.append(twitchircpy.Command(len(
-            self.commands), "removecommand", self, "_remove_command", None, ["delcom", "deletecom"]))
-        self._builtin_commands.append(twitchircpy.Command(
-            len(self.commands), "editcommand", self, "_edit_command", None, ["editcom"]))
+        self._add_builtin_command(twitchircpy.Command(
+            None, "addcommand", self, "_add_command", None, ["addcom"]))
+        self._add_builtin_command(twitchircpy.Command(
+            None, "removecommand", self, "_remove_command", None, ["delcom", "deletecom"]))
+        self._add_builtin_command(twitchircpy.Command(
+            None, "editcommand", self, "_edit_command", None, ["editcom"]))
 
     def _append_events(self):
         events_len = len(self.events)
@@ -0,0 +1,39 @@
+class Listener():
+
+    """
+    Class used for storing information about a filtered event listener.
+    Used internally to index listeners by channel, user and command.
+    Should not be manually created in most cases. Instead use the "event" decorator of class:Bot: with filters.
+
+    Parameters
+    ==========
+    event -> :str:
+        The name of the event the listener is hooked to.
+    function -> :function:
+        The function fired when the event passes the filters.
+    channel -> :str: | :None:
+        The channel the event has to come from.
+        Can be :None: to allow every channel.
+    user -> :str: | :None:
+        The user the event has to come from.
+        Can be :None: to allow every user.
+    command -> :str: | :None:
+        The name of the command the event has to be about.
+        Only used for events which include a command, like "command_fired".
+        Can be :None: to allow every command.
+    predicate -> :function: | :None:
+        Extra check called with the same arguments as the event.
+        Has to return a truthy value for the listener to fire.
+        Can be :None: if there is no extra check.
+    """
+
+    def __init__(self, event, function, channel=None, user=None, command=None, predicate=None):
+        self.event = event
+        self.function = function
+        self.channel = channel
+        self.user = user
+        self.command = command
+        self.predicate = predicate
+
+    def __repr__(self):
+        return f"Listener(event: {self.event}, channel: {self.channel}, user: {self.user}, command: {self.command}, function: {self.function})"
@@ -0,0 +1,31 @@
+class MessageBatch():
+
+    """
+    Class used for storing a batch of messages sent to a single channel.
+    Sent with the "on_message_batch" event once enough messages arrived or enough time passed.
+    Should not be manually created in most cases. Instead use the method: "start_message_batching" of class:Bot:.
+
+    Parameters
+    ==========
+    channel -> :str:
+        The channel that all of the messages got sent to.
+    messages -> :list<Message>:
+        The messages in the order they were received.
+    created -> :float:
+        Monotonic time of when the first message of the batch was received.
+        Used to flush the batch once the interval has passed.
+    """
+
+    def __init__(self, channel, messages, created):
+        self.channel = channel
+        self.messages = messages
+        self.created = created
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def __repr__(self):
+        return f"MessageBatch(channel: {self.channel}, messages: {len(self.messages)})"
@@ -0,0 +1,59 @@
+class PrefixMatcher():
+
+    """
+    Class used for matching the prefixes of a channel against messages.
+    Prefixes are grouped by their first character, so most messages are rejected after checking one character.
+    Should not be manually created in most cases. Instead use the prefix parameter or "set_channel_prefix" of class:Bot:.
+
+    Parameters
+    ==========
+    prefixes -> :list<str>:
+        The prefixes that commands can start with.
+    mention -> Optional[:str: | :None:]
+        The nick of the bot, allowing "@nick command" to be used as a prefix.
+        Can be :None: to disable mention prefixes.
+    """
+
+    def __init__(self, prefixes, mention=None):
+        self.prefixes = prefixes
+        self.mention = mention
+        self._empty = False
+        self._table = {}
+
+        for prefix in prefixes:
+            if not prefix:
+                self._empty = True
+                continue
+            self._table.setdefault(prefix[0], []).append((prefix, False))
+        if mention:
+            self._table.setdefault("@", []).append((f"@{mention.lower()}", True))
+
+        # Longest prefixes first so "!!" wins over "!".
+        for entries in self._table.values():
+            entries.sort(key=lambda entry: len(entry[0]), reverse=True)
+
+    def __repr__(self):
+        return f"PrefixMatcher(prefixes: {self.prefixes}, mention: {self.mention})"
+
+    def match(self, content):
+        """
+        Returns the index where the command starts, or :None: if the message does not start with a prefix.
+        """
+
+        entries = self._table.get(content[:1])
+        if entries:
+            for prefix, mention in entries:
+                if not mention:
+                    if content.startswith(prefix):
+                        return len(prefix)
+                    continue
+
+                # Mentions are case insensitive and have to be followed by a separator.
+                end = len(prefix)
+                if content[:end].lower() != prefix or content[end:end + 1] not in (" ", ",", ":"):
+                    continue
+                while content[end:end + 1] in (" ", ",", ":"):
+                    end += 1
+                return end
+
+        return 0 if self._empty else None
@@ -0,0 +1,80 @@
+class Quota():
+
+    """
+    Class used for limiting how often commands can be used.
+    Works as a token bucket: {limit} invocations are allowed, refilling at {limit} per {per} seconds.
+    Buckets which have fully refilled are dropped, so idle users/channels do not use any memory.
+    Should not be manually created in most cases. Instead use the method: "add_quota" of class:Bot:.
+
+    Parameters
+    ==========
+    limit -> :int:
+        The amount of invocations allowed within {per} seconds.
+    per -> :int: | :float:
+        The window in seconds.
+    scope -> :str:
+        What the quota is tracked for.
+        "user" (each user), "channel" (each channel) or "global" (the whole bot).
+    commands -> Optional[:list<str>: | :None:]
+        The names of the commands that share this quota.
+        Can be :None: for every command.
+    """
+
+    def __init__(self, limit, per, scope="user", commands=None):
+        self.limit = limit
+        self.per = per
+        self.scope = scope
+        self.commands = frozenset(commands) if commands else None
+        self.dropped = 0
+        self._rate = limit / per
+        self._buckets = {}
+        self._sweep_at = 256
+
+    def __repr__(self):
+        return f"Quota(limit: {self.limit}, per: {self.per}, scope: {self.scope}, commands: {self.commands}, dropped: {self.dropped})"
+
+    @property
+    def rate(self):
+        """
+        The amount of tokens refilled per second ({limit} / {per}).
+        """
+
+        return self._rate
+
+    def key(self, info):
+        if self.scope == "user":
+            return info.user
+        if self.scope == "channel":
+            return info.channel
+        return None
+
+    def available(self, key, now):
+        """
+        Returns the amount of tokens left in the bucket of {key}, without taking one.
+        """
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return self.limit
+        return min(self.limit, bucket[0] + (now - bucket[1]) * self._rate)
+
+    def consume(self, key, now):
+        """
+        Takes a token from the bucket of {key}, returning False (and counting the drop) if it is empty.
+        """
+
+        tokens = self.available(key, now)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            self.dropped += 1
+            return False
+
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) >= self._sweep_at:
+            self._sweep(now)
+        return True
+
+    def _sweep(self, now):
+        self._buckets = {key: bucket for key, bucket in self._buckets.items()
+                         if bucket[0] + (now - bucket[1]) * self._rate < self.limit}
+        self._sweep_at = max(256, len(self._buckets) * 2)
@@ -0,0 +1,88 @@
+import threading
+import time as ptime
+from collections import OrderedDict
+
+
+class ResponseCache():
+
+    """
+    Class used for memoizing the responses of commands.
+    A bounded LRU where entries expire {ttl} seconds after being computed.
+    Identical requests arriving while the response is being computed wait for that computation instead of running again.
+    Should not be manually created in most cases. Instead use the "cached" decorator.
+
+    Parameters
+    ==========
+    ttl -> :int: | :float:
+        The amount of seconds a response is kept for.
+    maxsize -> Optional[:int:]
+        The amount of responses to keep.
+        The least recently used responses are removed first.
+    """
+
+    def __init__(self, ttl, maxsize=256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"ResponseCache(ttl: {self.ttl}, entries: {len(self._entries)}, hits: {self.hits}, misses: {self.misses})"
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached response for {key}, calling {compute} if there is none.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > ptime.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                # [done, value, exception]
+                pending = [threading.Event(), None, None]
+                self._pending[key] = pending
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            pending[0].wait()
+            if pending[2] is not None:
+                raise pending[2]
+            return pending[1]
+
+        try:
+            value = compute()
+        except Exception as e:
+            pending[2] = e
+            raise
+        else:
+            pending[1] = value
+            with self._lock:
+                self._entries[key] = (ptime.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+            return value
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+            pending[0].set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+
+
+class RoleCache():
+
+    """
+    Class used for caching the roles of users in each channel.
+    Filled from the tags of PRIVMSG and USERSTATE, and invalidated by MODE and CLEARCHAT.
+    Roles are the badge names of the user, like "moderator", "subscriber" or "broadcaster".
+    Should not be manually created in most cases. Instead use the "roles" attribute of class:Bot:.
+
+    Parameters
+    ==========
+    maxsize -> Optional[:int:]
+        The amount of (user, channel) entries to keep.
+        The least recently used entries are removed first.
+    """
+
+    def __init__(self, maxsize=10000):
+        self.maxsize = maxsize
+        # (user_id, channel) -> [badges, mod, roles, login]
+        self._entries = OrderedDict()
+        self._logins = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"RoleCache(entries: {len(self._entries)}, maxsize: {self.maxsize})"
+
+    @staticmethod
+    def parse_badges(badges, mod=None):
+        """
+        Turns a badges tag (like "moderator/1,subscriber/12") into a :frozenset: of role names.
+        """
+
+        roles = set()
+        if badges:
+            for badge in badges.split(","):
+                name, _, version = badge.partition("/")
+                # Keep the old subscriber check, where "subscriber/0" does not count.
+                if name == "subscriber" and not (version.isdigit() and int(version) > 0):
+                    continue
+                roles.add(name)
+        if mod == 1 or mod == "1":
+            roles.add("moderator")
+        return frozenset(roles)
+
+    def update(self, user_id, login, channel, badges, mod=None):
+        """
+        Stores the badges of a user in a channel. Roles are only parsed once they are needed.
+        """
+
+        key = (user_id if user_id is not None else login, channel)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == badges and entry[1] == mod:
+                self._entries.move_to_end(key)
+                return
+
+            self._entries[key] = [badges, mod, None, login]
+            self._entries.move_to_end(key)
+            if login:
+                self._logins[(login, channel)] = key
+            while len(self._entries) > self.maxsize:
+                old_key, old = self._entries.popitem(last=False)
+                self._logins.pop((old[3], old_key[1]), None)
+
+    def get(self, user_id, channel):
+        """
+        Returns the roles of a user in a channel, or :None: if they are not cached.
+        """
+
+        with self._lock:
+            entry = self._entries.get((user_id, channel))
+            if entry is None:
+                return None
+            if entry[2] is None:
+                entry[2] = self.parse_badges(entry[0], entry[1])
+            return entry[2]
+
+    def resolve(self, info):
+        """
+        Returns the roles of the user that sent {info}, filling the cache if needed.
+        """
+
+        user_id = info.user_id if info.user_id is not None else info.user
+        with self._lock:
+            entry = self._entries.get((user_id, info.channel))
+            if entry is not None and entry[0] == info.badges and entry[1] == info.mod:
+                if entry[2] is None:
+                    entry[2] = self.parse_badges(entry[0], entry[1])
+                return entry[2]
+
+        self.update(info.user_id, info.user, info.channel, info.badges, info.mod)
+        return self.get(user_id, info.channel)
+
+    def invalidate(self, login, channel):
+        """
+        Removes the cached roles of a user (via login name) in a channel.
+        """
+
+        with self._lock:
+            key = self._logins.pop((login, channel), None)
+            if key is not None:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes every cached role.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._logins.clear()
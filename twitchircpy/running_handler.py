@@ -0,0 +1,31 @@
+class RunningHandler():
+
+    """
+    Class used for tracking a handler (command or event function) while the watchdog of class:Bot: is running.
+    Should not be manually created in most cases. Instead use the method: "start_watchdog" of class:Bot:.
+
+    Parameters
+    ==========
+    handler -> :function:
+        The function being tracked.
+        Used for quarantining it upon going over its budget.
+    budget -> :int: | :float:
+        The amount of seconds the handler is allowed to run for.
+    started -> Optional[:float: | :None:]
+        Monotonic time of when the handler started running.
+        Can be :None: while it waits for a worker, which does not count against its budget.
+    future -> Optional[:Future: | :None:]
+        The future of the handler when it runs on a watchdog worker.
+        Can be :None: when it runs on the calling thread.
+    """
+
+    def __init__(self, handler, budget, started=None, future=None):
+        self.handler = handler
+        self.budget = budget
+        self.started = started
+        self.future = future
+        # Set once the handler has been reported as over its budget, so it is only reported once.
+        self.reported = False
+
+    def __repr__(self):
+        return f"RunningHandler(handler: {getattr(self.handler, '__qualname__', self.handler)}, budget: {self.budget}, started: {self.started})"
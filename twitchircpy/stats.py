@@ -0,0 +1,131 @@
+import bisect
+import threading
+
+
+class CommandStats():
+
+    """
+    Class used for storing metrics about a single command.
+    Should not be manually created in most cases. Instead use the "stats" attribute of class:Bot:.
+    Example: bot.stats.commands["foo"].invocations
+
+    Parameters
+    ==========
+    name -> :str:
+        The name of the command.
+    """
+
+    # Upper bounds of the latency histogram buckets, in seconds. The last bucket is everything above.
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name):
+        self.name = name
+        self.invocations = 0
+        self.errors = 0
+        self.rejected = 0
+        self.cooldown_rejections = 0
+        self.silenced_rejections = 0
+        self.quota_rejections = 0
+        self.concurrency_rejections = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * (len(self.BUCKETS) + 1)
+
+    def __repr__(self):
+        return f"CommandStats(name: {self.name}, invocations: {self.invocations}, errors: {self.errors}, rejected: {self.rejected}, mean: {self.mean * 1000:.2f}ms, max: {self.max_time * 1000:.2f}ms)"
+
+    @property
+    def mean(self):
+        return self.total_time / self.invocations if self.invocations else 0.0
+
+    def observe(self, elapsed):
+        self.total_time += elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.histogram[bisect.bisect_left(self.BUCKETS, elapsed)] += 1
+
+    def percentile(self, p):
+        """
+        Returns the upper bound (in seconds) of the histogram bucket containing the {p} percentile (0-100).
+        Returns the max time for the last bucket.
+        """
+
+        total = sum(self.histogram)
+        if not total:
+            return 0.0
+        target = total * p / 100
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if seen >= target:
+                return self.BUCKETS[index] if index < len(self.BUCKETS) else self.max_time
+        return self.max_time
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "invocations": self.invocations,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "cooldown_rejections": self.cooldown_rejections,
+            "silenced_rejections": self.silenced_rejections,
+            "quota_rejections": self.quota_rejections,
+            "concurrency_rejections": self.concurrency_rejections,
+            "total_time": self.total_time,
+            "max_time": self.max_time,
+            "histogram": dict(zip([str(b) for b in self.BUCKETS] + ["+inf"], self.histogram))
+        }
+
+
+class Stats():
+
+    """
+    Class used for storing metrics about every command of class:Bot:.
+    Should not be manually created in most cases. Instead use the "stats" attribute of class:Bot:.
+    \nUse "add_exporter" to register a function which is given "to_dict()" whenever "export" is called.
+    """
+
+    def __init__(self):
+        self.commands = {}
+        self._exporters = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Stats(commands: {len(self.commands)})"
+
+    def command(self, name):
+        stats = self.commands.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.commands.setdefault(name, CommandStats(name))
+        return stats
+
+    def slowest(self, amount=10):
+        """
+        Returns the commands with the highest mean latency.
+        """
+
+        return sorted(self.commands.values(), key=lambda c: c.mean, reverse=True)[:amount]
+
+    def to_dict(self):
+        return {name: stats.to_dict() for name, stats in list(self.commands.items())}
+
+    def add_exporter(self, function):
+        self._exporters.append(function)
+
+    def remove_exporter(self, function):
+        if function in self._exporters:
+            self._exporters.remove(function)
+
+    def export(self):
+        """
+        Sends a snapshot of every command's metrics to each exporter.
+        """
+
+        snapshot = self.to_dict()
+        for exporter in self._exporters:
+            exporter(snapshot)
+
+    def reset(self):
+        with self._lock:
+            self.commands = {}
@@ -1,5 +1,7 @@
 import time as ptime
 
+from .chat_counter import ChatCounter
+
 
 class TimedMessage():
 
@@ -26,9 +28,27 @@ class TimedMessage():
         This time will reset if required_chats not met.
     function -> :function:
         The function that the timed message fires upon activation.
+    offset -> Optional[:int: | :float: | :None:]
+        The seconds to wait before the first attempt.
+        Can be :None: to wait {time} seconds.
+    jitter -> Optional[:float: | :None:]
+        How much each wait is randomly shortened or lengthened, as a fraction of {time} (0.1 being 10%).
+        Can be :None: to use the jitter given to "start_timed_messages".
+    adaptive -> Optional[:bool:]
+        Whether the time between attempts follows the chat rate of the channel.
+        Aims to attempt once every {required_chats} chats, kept within {min_time} and {max_time}.
+    min_time -> Optional[:int: | :float: | :None:]
+        The shortest time between attempts for adaptive timed messages.
+        Can be :None: for a quarter of {time}, lowered to {max_time} if that is shorter.
+    max_time -> Optional[:int: | :float: | :None:]
+        The longest time between attempts for adaptive timed messages.
+        Can be :None: for four times {time}, raised to {min_time} if that is longer.
+    counter -> Optional[:ChatCounter:]
+        The chat counter of the channel, shared by every timed message of the channel.
+        Should be given by class:Bot:.
     """
 
-    def __init__(self, name, required_chats, channel, time, function):
+    def __init__(self, name, required_chats, channel, time, function, offset=None, jitter=None, adaptive=False, min_time=None, max_time=None, counter=None):
         if type(required_chats) != int or required_chats <= 0:
             raise TypeError(
                 "required_chats has to be a positive integer which is also greater than 0.")
@@ -41,8 +61,38 @@ class TimedMessage():
         self.channel = channel
         self.time = time
         self.function = function
+        self.offset = offset
+        self.jitter = jitter
+        self.adaptive = adaptive
+        # A bound which is not given never conflicts with the one which is.
+        if min_time is None:
+            min_time = min(time / 4, max_time) if max_time is not None else time / 4
+        if max_time is None:
+            max_time = max(time * 4, min_time)
+        self.min_time = min_time
+        self.max_time = max_time
         self.last_called = ptime.time()
-        self.current_chats = 0
+        # Chats are counted once per channel; each timed message only keeps where it last reset.
+        self._counter = counter if counter is not None else ChatCounter()
+        self._baseline = self._counter.chats
+        # Monotonic time of the next attempt, set by the scheduler of class:Bot:. :None: once removed.
+        self.deadline = None
+
+    @property
+    def current_chats(self):
+        return self._counter.chats - self._baseline
+
+    @current_chats.setter
+    def current_chats(self, value):
+        self._baseline = self._counter.chats - value
+
+    @property
+    def chat_rate(self):
+        """
+        The moving average of chats per second in the channel, updated by class:Bot: when adaptive timed messages are attempted.
+        """
+
+        return self._counter.rate
 
     def __repr__(self):
         return f"TimedMessage(name: {self.name}, channel: {self.channel}, function: {self.function})"